@@ -0,0 +1,68 @@
+# app/core/conditional.py
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import Request, Response, status
+
+
+def _as_utc(value: datetime) -> datetime:
+    # В моделях naive datetime.utcnow — считаем их UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class Validators:
+    """
+    Валидаторы условного GET для одного ресурса.
+
+    Слабый ETag — хеш ключа ресурса и его «версии»: значений, от которых зависит
+    представление (updated_at, счётчики, максимальные updated_at вложенных объектов).
+    Версию дешевле прочитать отдельным запросом (`CRUDBase.get_version`), чем
+    загружать объект целиком: при совпадении ETag ответ 304 уходит без загрузки
+    и сериализации.
+
+    Last-Modified — самая поздняя из дат версии. If-Modified-Since учитывается только
+    если версия состоит из одних дат: изменение счётчика или состава не сдвигает ни одну из них.
+    """
+
+    def __init__(self, resource: str, key: Any, version: Sequence[Any]):
+        self.etag = 'W/"%s"' % hashlib.sha1(repr((resource, str(key), *version)).encode()).hexdigest()[:20]
+        timestamps = [_as_utc(part) for part in version if isinstance(part, datetime)]
+        self.last_modified: Optional[datetime] = max(timestamps) if timestamps else None
+        self._dates_only = bool(version) and all(part is None or isinstance(part, datetime) for part in version)
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def _etag_matches(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        # Слабое сравнение (RFC 9110, 13.1.2): префикс W/ не учитывается
+        opaque = self.etag[2:]
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    def is_fresh(self, request: Request) -> bool:
+        """Актуальна ли копия клиента. If-None-Match, если он есть, важнее If-Modified-Since."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return self._etag_matches(if_none_match)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self._dates_only and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            # В заголовке секунды, в БД — микросекунды
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
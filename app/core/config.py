@@ -1,12 +1,15 @@
 # app/core/config.py
 import os
 from typing import List, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Core settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "FastAPI Project"
+    # Готовая схема OpenAPI (scripts/export_openapi.py); без файла схема собирается при старте
+    OPENAPI_SCHEMA_PATH: Optional[str] = None
 
     # Database settings
     DB_USER: str = os.getenv("DB_USER", "postgres")
@@ -17,8 +20,38 @@ class Settings(BaseSettings):
     
     # SQLAlchemy
     DATABASE_URL: str = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+    # Пул соединений. Пустые значения выводятся из числа воркеров gunicorn и общего бюджета соединений
+    WEB_CONCURRENCY: Optional[int] = None
+    DB_MAX_CONNECTIONS_BUDGET: int = 90
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Read-реплика: если задана, GET-эндпоинты с get_read_db читают с неё.
+    # После записи чтения пользователя READ_REPLICA_PIN_SECONDS идут в primary (read-your-writes)
+    READ_DATABASE_URL: Optional[str] = None
+    READ_REPLICA_PIN_SECONDS: float = 5.0
+    # "redis" — метку видят все воркеры; "memory" — только один процесс (тесты/dev)
+    READ_REPLICA_PIN_BACKEND: str = "redis"
+    # Совместимость с PgBouncer в режиме transaction pooling: без кеша prepared statements
+    DB_PGBOUNCER_MODE: bool = False
+    # С approximate_total=true выше этого порога total берётся из оценки планировщика
+    APPROXIMATE_COUNT_THRESHOLD: int = 10_000
+    # Учёт SQL на запрос (app/db/instrumentation.py): заголовок Server-Timing и порог N+1
+    SQL_SERVER_TIMING_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    # Лог медленных запросов (app/db/slow_query.py); порог 0 отключает лог
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_MAX_PER_MINUTE: int = 6
+    SLOW_QUERY_EXPLAIN_DEDUP_SECONDS: float = 600.0
+    # ANALYZE повторно выполняет запрос, поэтому применяется только к SELECT
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = True
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
     
-    # JWT Settings for python-jose
+    # JWT Settings (app/core/tokens.py)
     # У нас есть обе переменные в .env, так что обе должны быть в модели
     SECRET_KEY: str = os.getenv("SECRET_KEY", "a_very_secret_key") 
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "a_very_secret_key")
@@ -27,6 +60,52 @@ class Settings(BaseSettings):
     # Token lifetimes
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # Повтор уже ротированного refresh-токена в течение этого окна отклоняется (401) без отзыва сессии:
+    # параллельные refresh или ретрай после потерянного ответа
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 30
+
+    # Сессии: лимит живых сессий на пользователя (0 — без лимита) и фоновая очистка истёкших
+    MAX_SESSIONS_PER_USER: int = 10
+    SESSION_REAPER_INTERVAL_SECONDS: float = 300.0
+    SESSION_REAPER_BATCH_SIZE: int = 1000
+
+    # Сверка денормализованных счётчиков постов (like_count, comment_count)
+    POST_COUNTER_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    POST_COUNTER_RECONCILE_BATCH_SIZE: int = 1000
+
+    # Кеш проверенных access-токенов (на процесс)
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 30.0
+
+    # Redis
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Кеш ответов справочников (sports, sponsors, playgrounds): LRU на процесс перед Redis.
+    # "redis" — общий уровень и инвалидация через pub/sub для всех воркеров,
+    # "memory" — только LRU процесса (один процесс: тесты/dev)
+    RESPONSE_CACHE_BACKEND: str = "redis"
+    RESPONSE_CACHE_MAX_SIZE: int = 1000
+    RESPONSE_CACHE_LOCAL_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_TTL_SECONDS: int = 600
+
+    # Кеш команд: представление доступа (владелец, участники) и тело GET /teams/{id}.
+    # Инвалидация при смене состава; "redis" — общий уровень и pub/sub для всех воркеров,
+    # "memory" — только LRU процесса (один процесс: тесты/dev)
+    TEAM_CACHE_BACKEND: str = "redis"
+    TEAM_CACHE_MAX_SIZE: int = 5000
+    TEAM_CACHE_LOCAL_TTL_SECONDS: float = 10.0
+    TEAM_CACHE_TTL_SECONDS: int = 300
+
+    # Отзыв токенов: "redis" — общий для всех воркеров, "memory" — локально (один процесс: тесты/dev)
+    REVOCATION_BACKEND: str = "redis"
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 5.0
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    # Пул для bcrypt (на процесс)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     # S3 Storage settings
     S3_ENDPOINT_URL: Optional[str] = None
@@ -37,6 +116,28 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
 
+    @model_validator(mode="after")
+    def _check_process_local_backends(self) -> "Settings":
+        # Бэкенд "memory" видит только свой процесс: отзыв, сделанный в одном воркере,
+        # остальные не увидели бы до истечения токена
+        if (self.WEB_CONCURRENCY or 1) > 1:
+            local = [name for name in self._shared_state_backends() if getattr(self, name) == "memory"]
+            if local:
+                raise ValueError(
+                    f"{', '.join(local)}=memory is per-process and cannot be used with "
+                    f"WEB_CONCURRENCY={self.WEB_CONCURRENCY}; use redis"
+                )
+        return self
+
+    def _shared_state_backends(self) -> List[str]:
+        # Без pub/sub инвалидация доходит только до своего воркера: остальные до *_LOCAL_TTL_SECONDS
+        # отдавали бы устаревшие справочники и пускали бы исключённого участника команды
+        backends = ["REVOCATION_BACKEND", "RESPONSE_CACHE_BACKEND", "TEAM_CACHE_BACKEND"]
+        if self.READ_DATABASE_URL:
+            # Следующий GET пользователя может попасть в другой воркер и прочитать реплику
+            backends.append("READ_REPLICA_PIN_BACKEND")
+        return backends
+
     class Config:
         case_sensitive = True
         env_file = ".env"
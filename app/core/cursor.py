@@ -0,0 +1,63 @@
+# app/core/cursor.py
+import base64
+import hashlib
+import hmac
+from datetime import datetime
+from typing import Any, Callable, Tuple
+
+import orjson
+
+from app.core.config import settings
+
+_SIGNATURE_SIZE = 16
+
+
+class CursorError(ValueError):
+    """Курсор повреждён или подписан не нашим ключом."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class CursorCodec:
+    """
+    Непрозрачный подписанный курсор keyset-пагинации: позиция `(created_at, id)`
+    последнего элемента страницы. Подпись не даёт клиенту подставить произвольную
+    позицию или значение другого типа в WHERE.
+    """
+
+    def __init__(self, secret_key: str):
+        # Отдельный ключ, чтобы курсор нельзя было выдать за JWT и наоборот
+        self._mac = hmac.new(b"cursor:" + secret_key.encode(), digestmod=hashlib.sha256)
+
+    def _sign(self, payload: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(payload)
+        return mac.digest()[:_SIGNATURE_SIZE]
+
+    def encode(self, created_at: datetime, id: Any) -> str:
+        payload = orjson.dumps([created_at.isoformat(), str(id)])
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, cursor: str, id_type: Callable[[str], Any]) -> Tuple[datetime, Any]:
+        try:
+            payload_part, signature_part = cursor.split(".")
+            payload = _b64decode(payload_part)
+            signature = _b64decode(signature_part)
+        except ValueError:
+            raise CursorError("Malformed cursor")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise CursorError("Cursor signature mismatch")
+        try:
+            created_at, id = orjson.loads(payload)
+            return datetime.fromisoformat(created_at), id_type(id)
+        except (TypeError, ValueError):
+            raise CursorError("Malformed cursor")
+
+
+cursor_codec = CursorCodec(settings.SECRET_KEY)
@@ -0,0 +1,105 @@
+# app/core/hashing.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config import settings
+from app.core.security import pwd_context
+
+
+HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Операции bcrypt, ожидающие или выполняющиеся в пуле хеширования",
+)
+HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Время ожидания свободного воркера пула хеширования",
+    ["operation"],
+)
+HASH_DURATION_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "Время выполнения операции bcrypt",
+    ["operation"],
+)
+HASH_REJECTED_TOTAL = Counter(
+    "password_hash_rejected_total",
+    "Операции, отклонённые из-за переполнения очереди хеширования",
+    ["operation"],
+)
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в отдельном пуле потоков, чтобы не блокировать event loop.
+
+    bcrypt отпускает GIL на время вычисления, поэтому пула потоков достаточно.
+    Если в очереди уже `max_pending` операций, новая отклоняется с 503 —
+    всплеск логинов замедляет только сам логин, а не остальной API.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            HASH_REJECTED_TOTAL.labels(operation).inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted_at = time.perf_counter()
+
+        def timed_call() -> Any:
+            started_at = time.perf_counter()
+            HASH_WAIT_SECONDS.labels(operation).observe(started_at - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                HASH_DURATION_SECONDS.labels(operation).observe(time.perf_counter() - started_at)
+
+        self._pending += 1
+        HASH_QUEUE_DEPTH.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, timed_call)
+        finally:
+            self._pending -= 1
+            HASH_QUEUE_DEPTH.dec()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password(password: str) -> str:
+    """Создает хеш из пароля вне event loop."""
+    return await password_hasher.run("hash", pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Проверяет пароль вне event loop."""
+    return await password_hasher.run("verify", pwd_context.verify, plain_password, hashed_password)
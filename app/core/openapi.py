@@ -0,0 +1,105 @@
+# app/core/openapi.py
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+import structlog
+from fastapi import FastAPI, Request, Response, status
+from fastapi.openapi.utils import get_openapi
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+def patch_openapi(doc: dict) -> dict:
+    """
+    Правки схемы для генератора клиента (openapitools.json): `anyOf [X, null]` → X
+    с `nullable: true`, формат (например, uuid) не трогаем. Меняет `doc` на месте.
+    """
+    stack: list[Any] = [doc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "anyOf" in node:
+                types = [x.get("type") for x in node["anyOf"] if isinstance(x, dict)]
+                if "null" in types:
+                    base = next((x for x in node["anyOf"] if x.get("type") != "null"), None)
+                    if base:
+                        node.pop("anyOf", None)
+                        node.update(base)
+                        node["nullable"] = True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return doc
+
+
+def build_openapi(app: FastAPI) -> dict:
+    # get_openapi каждый раз собирает новый словарь, копировать перед правкой не нужно
+    schema = get_openapi(title=settings.PROJECT_NAME, version="1.0.0",
+                         description="Prodvor API", routes=app.routes)
+    return patch_openapi(schema)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class OpenAPIDocument:
+    """
+    Готовый `/openapi.json`: схема собирается и сериализуется один раз, вместе
+    с gzip-версией и ETag, дальше отдаются одни и те же байты.
+
+    Если задан `OPENAPI_SCHEMA_PATH` и файл существует (его пишет
+    `scripts/export_openapi.py` при сборке), схема берётся из него без обхода роутов.
+    """
+
+    def __init__(self) -> None:
+        self.body: Optional[bytes] = None
+        self._gzip_body = b""
+        self._etag = ""
+
+    def _set(self, body: bytes) -> None:
+        self._gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        self._etag = hashlib.sha256(body).hexdigest()[:32]
+        self.body = body
+
+    def load(self, app: FastAPI) -> None:
+        path = Path(settings.OPENAPI_SCHEMA_PATH) if settings.OPENAPI_SCHEMA_PATH else None
+        if path is not None and path.is_file():
+            body = path.read_bytes()
+            app.openapi_schema = orjson.loads(body)
+            logger.info("openapi_schema_loaded", path=str(path))
+        else:
+            body = orjson.dumps(app.openapi())
+        self._set(body)
+
+    def response(self, request: Request, app: FastAPI) -> Response:
+        if self.body is None:
+            # Без lifespan (например, TestClient без with) — собираем при первом запросе
+            self.load(app)
+        use_gzip = _accepts_gzip(request)
+        # У сжатого представления свой ETag (RFC 9110, 8.8.3)
+        etag = f'"{self._etag}-gzip"' if use_gzip else f'"{self._etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=self._gzip_body, media_type="application/json", headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+openapi_document = OpenAPIDocument()
@@ -0,0 +1,23 @@
+# app/core/redis.py
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_client: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    """Возвращает общий для процесса клиент Redis (создаётся лениво)."""
+    global _client
+    if _client is None:
+        _client = Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
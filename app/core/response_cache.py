@@ -0,0 +1,210 @@
+# app/core/response_cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+from fastapi import Request, Response
+from prometheus_client import Counter
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "Обращения к кешу ответов справочников по уровню, который ответил",
+    ["namespace", "result"],
+)
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def serialize(response_model: Any, content: Any) -> bytes:
+    """JSON ответа так же, как его собрал бы FastAPI по `response_model` (ORM-объекты, алиасы)."""
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+class ResponseCache:
+    """
+    Кеш готовых тел ответов для редко меняющихся справочников.
+
+    Первый уровень — LRU в памяти процесса с коротким TTL, второй — Redis
+    (если `RESPONSE_CACHE_BACKEND == "redis"`), далее — loader. Ключ состоит из
+    namespace, его поколения и пути с отсортированными query-параметрами.
+
+    `invalidate` увеличивает поколение namespace в Redis и публикует его в канал:
+    каждый воркер в `listen` сбрасывает свои записи, а ключи Redis со старым
+    поколением просто истекают. Одновременные промахи по одному ключу внутри
+    процесса ждут один loader, а не идут в БД каждый.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        local_ttl_seconds: float,
+        ttl_seconds: int,
+        use_redis: bool,
+        channel: str = "cache:responses:invalidate",
+    ):
+        self.max_size = max_size
+        self.local_ttl_seconds = local_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.channel = channel
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"cache:responses:gen:{namespace}"
+
+    @staticmethod
+    def request_key(request: Request) -> str:
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{params}"
+
+    async def _generation(self, namespace: str) -> int:
+        # Поколение тоже кешируется с локальным TTL: пропущенное сообщение pub/sub
+        # задерживает инвалидацию не дольше чем на local_ttl_seconds
+        entry = self._generations.get(namespace)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        generation = entry[1] if entry else 0
+        if self.use_redis:
+            generation = int(await get_redis().get(self._generation_key(namespace)) or 0)
+        self._generations[namespace] = (time.monotonic() + self.local_ttl_seconds, generation)
+        return generation
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def _set_local(self, key: str, body: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.local_ttl_seconds, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _apply_invalidation(self, namespace: str, generation: int) -> None:
+        current = self._generations.get(namespace)
+        if current is None or current[1] < generation:
+            self._generations[namespace] = (time.monotonic() + self.local_ttl_seconds, generation)
+        prefix = f"{namespace}:"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def _load(self, namespace: str, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        if self.use_redis:
+            cached = await get_redis().get(f"cache:responses:{key}")
+            if cached is not None:
+                RESPONSE_CACHE_REQUESTS.labels(namespace, "redis").inc()
+                self._set_local(key, cached)
+                return cached
+        RESPONSE_CACHE_REQUESTS.labels(namespace, "miss").inc()
+        body = await loader()
+        self._set_local(key, body)
+        if self.use_redis:
+            await get_redis().set(f"cache:responses:{key}", body, ex=self.ttl_seconds)
+        return body
+
+    async def get_or_load(
+        self, namespace: str, request_key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        key = f"{namespace}:{await self._generation(namespace)}:{request_key}"
+        body = self._get_local(key)
+        if body is not None:
+            RESPONSE_CACHE_REQUESTS.labels(namespace, "local").inc()
+            return body
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            RESPONSE_CACHE_REQUESTS.labels(namespace, "coalesced").inc()
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Ведущий запрос отменён (клиент ушёл) — загружаем сами
+                return await self._load(namespace, key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await self._load(namespace, key, loader)
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # ожидающих может не быть — не пишем "exception was never retrieved"
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(body)
+            return body
+        finally:
+            self._inflight.pop(key, None)
+
+    async def respond(
+        self, namespace: str, request: Request, loader: Callable[[], Awaitable[bytes]]
+    ) -> Response:
+        body = await self.get_or_load(namespace, self.request_key(request), loader)
+        return Response(content=body, media_type="application/json")
+
+    async def invalidate(self, namespace: str) -> None:
+        """Сбрасывает все закешированные ответы namespace во всех воркерах."""
+        if not self.use_redis:
+            current = self._generations.get(namespace)
+            self._apply_invalidation(namespace, (current[1] if current else 0) + 1)
+            return
+        redis = get_redis()
+        generation = await redis.incr(self._generation_key(namespace))
+        self._apply_invalidation(namespace, generation)
+        await redis.publish(self.channel, f"{namespace}:{generation}")
+
+    async def listen(self) -> None:
+        """Фоновая задача: применяет инвалидации, опубликованные другими воркерами."""
+        if not self.use_redis:
+            return
+        while True:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    namespace, _, generation = data.rpartition(":")
+                    self._apply_invalidation(namespace, int(generation))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("response_cache_listener_failed")
+                # Сообщения, пришедшие без подписки, потеряны: локальный уровень больше не доверяем
+                self._entries.clear()
+                self._generations.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+
+response_cache = ResponseCache(
+    max_size=settings.RESPONSE_CACHE_MAX_SIZE,
+    local_ttl_seconds=settings.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    use_redis=settings.RESPONSE_CACHE_BACKEND == "redis",
+)
@@ -0,0 +1,169 @@
+# app/core/revocation.py
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+
+class BloomFilter:
+    """Простой bloom-фильтр поверх bytearray с двойным хешированием."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationBackend(ABC):
+    """Хранилище отозванных `jti`. Записи живут до `exp` токена."""
+
+    @abstractmethod
+    async def add(self, jti: str, exp: float) -> None:
+        ...
+
+    @abstractmethod
+    async def contains(self, jti: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def live_jtis(self) -> List[str]:
+        """Все ещё не истёкшие `jti` — для пересборки bloom-фильтра."""
+
+
+class InMemoryRevocationBackend(RevocationBackend):
+    """
+    Локальная замена Redis для тестов и разработки (виден только в своём процессе).
+    С несколькими воркерами не запускается (см. `Settings._check_process_local_backends`).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+
+    async def add(self, jti: str, exp: float) -> None:
+        self._entries[jti] = exp
+
+    async def contains(self, jti: str) -> bool:
+        exp = self._entries.get(jti)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            del self._entries[jti]
+            return False
+        return True
+
+    async def live_jtis(self) -> List[str]:
+        now = time.time()
+        self._entries = {jti: exp for jti, exp in self._entries.items() if exp > now}
+        return list(self._entries)
+
+
+class RedisRevocationBackend(RevocationBackend):
+    """
+    Отозванные `jti` хранятся в одном sorted set со score = `exp`,
+    истёкшие записи вычищаются при каждой синхронизации.
+    """
+
+    def __init__(self, key: str = "auth:revoked"):
+        self.key = key
+
+    async def add(self, jti: str, exp: float) -> None:
+        await get_redis().zadd(self.key, {jti: exp})
+
+    async def contains(self, jti: str) -> bool:
+        exp = await get_redis().zscore(self.key, jti)
+        return exp is not None and exp > time.time()
+
+    async def live_jtis(self) -> List[str]:
+        redis = get_redis()
+        now = time.time()
+        await redis.zremrangebyscore(self.key, "-inf", now)
+        members = await redis.zrangebyscore(self.key, now, "+inf")
+        return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+
+class RevocationStore:
+    """
+    Проверка отзыва токенов с локальным bloom-фильтром перед общим хранилищем.
+
+    Если `jti` нет в фильтре, токен точно не отозван и запрос не покидает процесс.
+    Фильтр периодически пересобирается из хранилища, чтобы увидеть отзывы,
+    сделанные другими воркерами.
+    """
+
+    def __init__(self, backend: RevocationBackend, capacity: int, error_rate: float):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._syncing = False
+        self._revoked_during_sync: List[str] = []
+
+    async def revoke(self, jti: str, exp: Optional[float]) -> None:
+        if exp is None:
+            exp = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        await self.backend.add(jti, float(exp))
+        self._bloom.add(jti)
+        if self._syncing:
+            self._revoked_during_sync.append(jti)
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        return await self.backend.contains(jti)
+
+    async def sync(self) -> None:
+        self._syncing = True
+        self._revoked_during_sync = []
+        try:
+            jtis = await self.backend.live_jtis()
+        finally:
+            self._syncing = False
+        bloom = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+        # Отзывы этого процесса, пришедшие во время чтения снимка, не теряем
+        for jti in [*jtis, *self._revoked_during_sync]:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def run_sync_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("revocation_sync_failed")
+            await asyncio.sleep(interval)
+
+
+def _build_backend() -> RevocationBackend:
+    if settings.REVOCATION_BACKEND == "redis":
+        return RedisRevocationBackend()
+    return InMemoryRevocationBackend()
+
+
+revocation_store = RevocationStore(
+    backend=_build_backend(),
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
@@ -1,16 +1,19 @@
 # app/core/security.py
-import uuid
-from datetime import datetime, timedelta, timezone
+import hashlib
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from passlib.context import CryptContext
-from jose import jwt, JWTError
 from pydantic import ValidationError
 
 from app.core.config import settings
-from app.schemas.token import TokenPayload
+from app.core.revocation import revocation_store
+from app.core.token_cache import verified_tokens
+from app.core.tokens import TokenError, token_codec
+from app.schemas.token import Principal, TokenPayload
 
 
 # Password Hashing
+# Синхронные функции блокируют event loop; в async-коде используйте app.core.hashing.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,73 +25,89 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-# In-memory blacklist for revoked tokens (for dev purposes)
-# In production, use a persistent store like Redis.
-_BLACKLIST = set()
+async def revoke_token(jti: str, exp: Optional[float] = None) -> None:
+    """Отзывает access-токен во всех воркерах (см. `app.core.revocation`)."""
+    await revocation_store.revoke(jti, exp)
+    verified_tokens.discard(jti)
 
-def add_to_blacklist(jti: str):
-    _BLACKLIST.add(jti)
 
-def is_blacklisted(jti: str) -> bool:
-    return jti in _BLACKLIST
+async def revoke_access_token(token: str) -> None:
+    """
+    Отзывает предъявленный access-токен до его `exp`.
+    Поддельный или истёкший токен молча пропускается: отзывать в нём нечего.
+    """
+    try:
+        claims = token_codec.decode(token)
+    except TokenError:
+        return
+    if claims.get("jti"):
+        await revoke_token(claims["jti"], claims.get("exp"))
 
 
-def create_access_token(subject: str | Any) -> str:
+def create_access_token(subject: str | Any, token_version: int = 0) -> str:
     """
     Создает новый Access-токен.
     :param subject: Идентификатор пользователя (или другие данные), который будет храниться в 'sub'.
+    :param token_version: Текущее значение `users.token_version`, хранится в 'ver'.
     """
-    expire = datetime.now(timezone.utc) + timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    token, _ = token_codec.create(
+        subject, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, ver=token_version
     )
-    to_encode = {
-        "exp": expire,
-        "sub": str(subject),
-        "jti": str(uuid.uuid4()), # Уникальный идентификатор токена
-    }
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
-
-def create_refresh_token(subject: str | Any) -> str:
+    return token
+
+def create_refresh_token(subject: str | Any) -> tuple[str, datetime]:
     """
-    Создает новый Refresh-токен.
+    Создает новый Refresh-токен. Возвращает токен и момент его истечения.
     """
-    expire = datetime.now(timezone.utc) + timedelta(
-        minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES
-    )
-    to_encode = {
-        "exp": expire,
-        "sub": str(subject),
-        "jti": str(uuid.uuid4()), # Уникальный идентификатор токена
-    }
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
-
-def verify_token(
-    token: str, 
-    secret_key: str, 
-    algorithm: str, 
-    credentials_exception: Exception
-) -> TokenPayload:
+    token, exp = token_codec.create(subject, settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60)
+    return token, datetime.fromtimestamp(exp, tz=timezone.utc)
+
+def verify_token(token: str, credentials_exception: Exception) -> TokenPayload:
     try:
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
-        # Check if the token has been revoked
-        if is_blacklisted(payload.get("jti")):
-            raise credentials_exception
+        payload = token_codec.decode(token)
         token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
+    except (TokenError, ValidationError):
         raise credentials_exception
     return token_data
 
+async def get_principal(
+    token: str,
+    credentials_exception: Exception
+) -> Principal:
+    """
+    Возвращает principal для access-токена.
+    Проверенные токены берутся из кеша `verified_tokens`, минуя разбор подписи;
+    отзыв проверяется при каждом вызове.
+    """
+    try:
+        jti = token_codec.unverified_claims(token).get("jti")
+    except TokenError:
+        raise credentials_exception
+
+    principal = verified_tokens.get(jti, token)
+    if principal is None:
+        try:
+            claims = token_codec.decode(token)
+            principal = Principal(
+                id=claims["sub"], jti=claims.get("jti"), token_version=claims.get("ver", 0)
+            )
+        except (TokenError, KeyError, ValidationError):
+            raise credentials_exception
+        verified_tokens.put(token, principal, claims["exp"])
+    if await revocation_store.is_revoked(jti):
+        raise credentials_exception
+    return principal
+
+def hash_token(token: str) -> bytes:
+    """sha256 от токена — то, что хранится в БД вместо самого refresh-токена."""
+    return hashlib.sha256(token.encode()).digest()
+
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Декодирует токен, проверяя его подпись и срок жизни.
     Возвращает payload в случае успеха, иначе None.
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
-    except JWTError:
+        return token_codec.decode(token)
+    except TokenError:
         return None
@@ -0,0 +1,163 @@
+# app/core/team_cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, FrozenSet, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import orjson
+import structlog
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+
+class TeamAccess(NamedTuple):
+    """Всё, что нужно для проверки прав на команду, без загрузки профилей участников."""
+    owner_id: UUID
+    member_ids: FrozenSet[UUID]
+
+    def is_member(self, user_id: UUID) -> bool:
+        return user_id in self.member_ids
+
+
+class TeamCache:
+    """
+    Кеш команд: представление доступа `TeamAccess` и готовое тело `GET /teams/{id}`.
+
+    Первый уровень — LRU в памяти процесса с коротким TTL, второй — Redis
+    (если `TEAM_CACHE_BACKEND == "redis"`). Тело хранится под ETag версии команды,
+    поэтому правка команды или профиля участника просто даёт новый ключ.
+    Смена состава вызывает `invalidate`: записи команды удаляются из Redis,
+    а через pub/sub — из LRU всех воркеров.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        local_ttl_seconds: float,
+        ttl_seconds: int,
+        use_redis: bool,
+        channel: str = "cache:teams:invalidate",
+    ):
+        self.max_size = max_size
+        self.local_ttl_seconds = local_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.channel = channel
+        # Ключ — (team_id, "access") или (team_id, etag)
+        self._entries: "OrderedDict[Tuple[UUID, str], Tuple[float, object]]" = OrderedDict()
+
+    @staticmethod
+    def _access_key(team_id: UUID) -> str:
+        return f"cache:teams:{team_id}:access"
+
+    @staticmethod
+    def _body_key(team_id: UUID) -> str:
+        return f"cache:teams:{team_id}:body"
+
+    def _get_local(self, key: Tuple[UUID, str]) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: Tuple[UUID, str], value: object) -> None:
+        self._entries[key] = (time.monotonic() + self.local_ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _drop_local(self, team_id: UUID) -> None:
+        for key in [key for key in self._entries if key[0] == team_id]:
+            del self._entries[key]
+
+    async def get_access(
+        self, team_id: UUID, loader: Callable[[], Awaitable[Optional[TeamAccess]]]
+    ) -> Optional[TeamAccess]:
+        """`TeamAccess` команды или None, если её нет (отсутствие не кешируется)."""
+        access = self._get_local((team_id, "access"))
+        if access is not None:
+            return access
+
+        if self.use_redis:
+            cached = await get_redis().get(self._access_key(team_id))
+            if cached is not None:
+                owner_id, member_ids = orjson.loads(cached)
+                access = TeamAccess(UUID(owner_id), frozenset(UUID(m) for m in member_ids))
+                self._set_local((team_id, "access"), access)
+                return access
+
+        access = await loader()
+        if access is not None:
+            self._set_local((team_id, "access"), access)
+            if self.use_redis:
+                payload = orjson.dumps([str(access.owner_id), [str(m) for m in access.member_ids]])
+                await get_redis().set(self._access_key(team_id), payload, ex=self.ttl_seconds)
+        return access
+
+    async def get_body(self, team_id: UUID, etag: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Сериализованная команда для версии `etag`."""
+        body = self._get_local((team_id, etag))
+        if body is not None:
+            return body
+
+        redis = get_redis() if self.use_redis else None
+        if redis is not None:
+            body = await redis.hget(self._body_key(team_id), etag)
+            if body is not None:
+                self._set_local((team_id, etag), body)
+                return body
+
+        body = await loader()
+        self._set_local((team_id, etag), body)
+        if redis is not None:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._body_key(team_id), etag, body)
+                pipe.expire(self._body_key(team_id), self.ttl_seconds)
+                await pipe.execute()
+        return body
+
+    async def invalidate(self, team_id: UUID) -> None:
+        """Сбрасывает всё закешированное о команде во всех воркерах (после смены состава)."""
+        self._drop_local(team_id)
+        if self.use_redis:
+            redis = get_redis()
+            await redis.delete(self._access_key(team_id), self._body_key(team_id))
+            await redis.publish(self.channel, str(team_id))
+
+    async def listen(self) -> None:
+        """Фоновая задача: применяет инвалидации, опубликованные другими воркерами."""
+        if not self.use_redis:
+            return
+        while True:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    data = message["data"]
+                    self._drop_local(UUID(data.decode() if isinstance(data, bytes) else data))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("team_cache_listener_failed")
+                # Инвалидации, пришедшие без подписки, потеряны: локальный уровень больше не доверяем
+                self._entries.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+
+team_cache = TeamCache(
+    max_size=settings.TEAM_CACHE_MAX_SIZE,
+    local_ttl_seconds=settings.TEAM_CACHE_LOCAL_TTL_SECONDS,
+    ttl_seconds=settings.TEAM_CACHE_TTL_SECONDS,
+    use_redis=settings.TEAM_CACHE_BACKEND == "redis",
+)
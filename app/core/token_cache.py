@@ -0,0 +1,72 @@
+# app/core/token_cache.py
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.token import Principal
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """
+    LRU-кеш уже проверенных access-токенов в памяти процесса.
+
+    Ключ — `jti` токена. Вместе с principal хранится sha256 исходной строки
+    токена, поэтому чужой токен с тем же `jti` не получит попадание в кеш.
+    Запись живёт не дольше `ttl_seconds` и не дольше `exp` самого токена.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jti: Optional[str], token: str) -> Optional[Principal]:
+        if not jti or self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            digest, expires_at, principal = entry
+            if expires_at <= time.time():
+                del self._entries[jti]
+                return None
+            if not hmac.compare_digest(digest, _digest(token)):
+                return None
+            self._entries.move_to_end(jti)
+            return principal
+
+    def put(self, token: str, principal: Principal, exp: Optional[float]) -> None:
+        if not principal.jti or self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._entries[principal.jti] = (_digest(token), expires_at, principal)
+            self._entries.move_to_end(principal.jti)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, jti: str) -> None:
+        with self._lock:
+            self._entries.pop(jti, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
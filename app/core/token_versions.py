@@ -0,0 +1,91 @@
+# app/core/token_versions.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+class TokenVersionCache:
+    """
+    Кеш `users.token_version` для проверки claim `ver` в access-токенах.
+
+    Первый уровень — LRU в памяти процесса с коротким TTL, второй — Redis
+    (если `REVOCATION_BACKEND == "redis"`), далее — БД через переданный loader.
+    Повышение версии в другом воркере становится видно не позже чем через TTL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, use_redis: bool):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[UUID, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _redis_key(user_id: UUID) -> str:
+        return f"auth:token_version:{user_id}"
+
+    def _get_local(self, user_id: UUID) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, version = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return version
+
+    def _set_local(self, user_id: UUID, version: int) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(
+        self, user_id: UUID, loader: Callable[[], Awaitable[Optional[int]]]
+    ) -> Optional[int]:
+        """Текущая версия пользователя или None, если пользователя нет."""
+        version = self._get_local(user_id)
+        if version is not None:
+            return version
+
+        if self.use_redis:
+            cached = await get_redis().get(self._redis_key(user_id))
+            if cached is not None:
+                version = int(cached)
+                self._set_local(user_id, version)
+                return version
+
+        version = await loader()
+        if version is not None:
+            self._set_local(user_id, version)
+            if self.use_redis:
+                # nx: не затираем версию, которую успели повысить параллельно
+                await get_redis().set(
+                    self._redis_key(user_id), version,
+                    ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, nx=True,
+                )
+        return version
+
+    async def set(self, user_id: UUID, version: int) -> None:
+        """Записывает новую версию после её повышения в БД."""
+        self._set_local(user_id, version)
+        if self.use_redis:
+            await get_redis().set(
+                self._redis_key(user_id), version,
+                ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            )
+
+
+token_versions = TokenVersionCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+    use_redis=settings.REVOCATION_BACKEND == "redis",
+)
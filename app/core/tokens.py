@@ -0,0 +1,114 @@
+# app/core/tokens.py
+import base64
+import hashlib
+import hmac
+import time
+import uuid
+from typing import Any, Dict, Tuple
+
+import orjson
+
+from app.core.config import settings
+
+_HASHES = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class TokenError(Exception):
+    """Токен повреждён, подписан не нашим ключом или истёк."""
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    # Строгий base64url: без "=" и символов вне [A-Za-z0-9_-]. Нестрогий декодер молча
+    # отбрасывает лишнее, и разные строки проходили бы проверку как один и тот же токен
+    decoded = base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+    if _b64encode(decoded) != data:
+        raise ValueError("Non-canonical base64url segment")
+    return decoded
+
+
+class TokenCodec:
+    """
+    Единый кодек JWT (HS256/384/512) для access- и refresh-токенов.
+
+    HMAC-ключ и заголовок токена подготавливаются один раз: на каждый вызов
+    остаются только `hmac.copy()`, base64 и orjson. Проверяются подпись,
+    `alg` и `exp`; остальные claims возвращаются как есть.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str):
+        if algorithm not in _HASHES:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self._mac = hmac.new(secret_key.encode(), digestmod=_HASHES[algorithm])
+        self._header = _b64encode(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        signing_input = self._header + b"." + _b64encode(orjson.dumps(claims))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
+
+    def _split(self, token: str) -> Tuple[bytes, bytes, bytes]:
+        try:
+            header, payload, signature = token.encode().split(b".")
+        except ValueError:
+            raise TokenError("Malformed token")
+        return header, payload, signature
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        header, payload, signature = self._split(token)
+        if header != self._header:
+            # Токены, выпущенные python-jose, могут отличаться порядком ключей в заголовке
+            try:
+                alg = orjson.loads(_b64decode(header)).get("alg")
+            except (ValueError, AttributeError):
+                raise TokenError("Malformed token header")
+            if alg != self.algorithm:
+                raise TokenError("Unexpected token algorithm")
+        try:
+            valid = hmac.compare_digest(
+                _b64decode(signature), self._sign(header + b"." + payload)
+            )
+            claims = orjson.loads(_b64decode(payload)) if valid else None
+        except ValueError:
+            raise TokenError("Malformed token")
+        if claims is None:
+            raise TokenError("Signature verification failed")
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token payload")
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            raise TokenError("Token has expired")
+        return claims
+
+    def unverified_claims(self, token: str) -> Dict[str, Any]:
+        """Claims без проверки подписи — только для выбора ключа кеша или поиска сессии."""
+        _, payload, signature = self._split(token)
+        try:
+            _b64decode(signature)  # только форма: вариант токена с мусором не должен давать те же claims
+            claims = orjson.loads(_b64decode(payload))
+        except ValueError:
+            raise TokenError("Malformed token payload")
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token payload")
+        return claims
+
+    def create(self, subject: Any, lifetime_seconds: int, **extra: Any) -> Tuple[str, int]:
+        """Выпускает токен с `sub`, `exp`, `jti` и доп. claims. Возвращает токен и `exp`."""
+        exp = int(time.time()) + lifetime_seconds
+        claims = {"sub": str(subject), "exp": exp, "jti": str(uuid.uuid4()), **extra}
+        return self.encode(claims), exp
+
+
+token_codec = TokenCodec(settings.SECRET_KEY, settings.ALGORITHM)
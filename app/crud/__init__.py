@@ -4,6 +4,7 @@ from .crud_team import team
 from .crud_post import post
 from .crud_comment import comment
 from .crud_friend_request import friend_request
+from .crud_friendship import friendship
 from .crud_lfg import lfg
 from .crud_playground import playground
 from .crud_like import like
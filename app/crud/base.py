@@ -1,10 +1,16 @@
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import json
+from typing import Any, Dict, Generic, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar, Union
 
+from fastapi import HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy import Select, func, insert, inspect, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.config import settings
+from app.core.cursor import CursorError, cursor_codec
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -12,7 +18,69 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+class OffsetPage(NamedTuple):
+    items: List[Any]
+    total: int
+    approximate: bool = False
+
+
+async def _estimate_rows(db: AsyncSession, query: Select) -> int:
+    """Оценка числа строк запроса по плану (`EXPLAIN`), без его выполнения."""
+    connection = await db.connection()
+    sql = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    *,
+    offset: int,
+    limit: int,
+    approximate: bool = False,
+) -> OffsetPage:
+    """
+    Страница и общее число строк одним запросом: к `query` добавляется
+    `count(*) OVER ()`, который считается до OFFSET/LIMIT.
+
+    Если страница пуста (offset за концом выборки), окно не вернуло ни одной
+    строки — только тогда total досчитывается отдельным `count()`.
+    С `approximate=True` сначала берётся оценка планировщика; если она не меньше
+    `APPROXIMATE_COUNT_THRESHOLD`, точный подсчёт пропускается и total помечается как приблизительный.
+    """
+    if approximate:
+        estimate = await _estimate_rows(db, query)
+        if estimate >= settings.APPROXIMATE_COUNT_THRESHOLD:
+            result = await db.execute(query.offset(offset).limit(limit))
+            return OffsetPage(items=list(result.scalars().unique().all()), total=estimate, approximate=True)
+
+    windowed = query.add_columns(func.count().over().label("total")).offset(offset).limit(limit)
+    rows = (await db.execute(windowed)).unique().all()
+    if rows:
+        return OffsetPage(items=[row[0] for row in rows], total=rows[0].total)
+    if offset == 0:
+        return OffsetPage(items=[], total=0)
+    total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    return OffsetPage(items=[], total=total or 0)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Методы записи не фиксируют транзакцию: изменения уходят в БД (`flush`/RETURNING),
+    а `commit` делает владелец сессии — `get_db` один раз в конце запроса,
+    фоновые задачи и скрипты — явно.
+    """
+    # Сколько строк уходит в один многострочный INSERT/UPDATE в *_many-методах
+    bulk_chunk_size: int = 500
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
@@ -25,13 +93,57 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(select(self.model).offset(skip).limit(limit))
         return result.scalars().all()
 
+    def _version_columns(self) -> List[Any]:
+        """Колонки, от которых зависит представление объекта (см. `get_version`)."""
+        return [self.model.updated_at]
+
+    async def get_version(self, db: AsyncSession, id: Any) -> Optional[Tuple[Any, ...]]:
+        """
+        Версия объекта для ETag узким запросом по первичному ключу, без загрузки
+        объекта и его связей. None — объекта нет.
+        """
+        statement = select(*self._version_columns()).where(self.model.id == id)
+        row = (await db.execute(statement)).first()
+        return None if row is None else tuple(row)
+
+    def page_query(self, *, cursor: Optional[str] = None, limit: int = 20, query: Optional[Select] = None) -> Select:
+        """Запрос страницы для `get_page`: на одну строку больше `limit`, чтобы узнать, есть ли следующая."""
+        created_at, id_column = self.model.created_at, self.model.id
+        query = select(self.model) if query is None else query
+        if cursor:
+            try:
+                after = cursor_codec.decode(cursor, id_column.type.python_type)
+            except CursorError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            query = query.where(tuple_(created_at, id_column) < tuple_(*after))
+        return query.order_by(created_at.desc(), id_column.desc()).limit(limit + 1)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        query: Optional[Select] = None,
+    ) -> Page:
+        """
+        Keyset-пагинация по `(created_at, id)` от новых к старым.
+        Вместо OFFSET — условие `(created_at, id) < позиция курсора`, поэтому
+        любая страница стоит одного прохода по индексу `(created_at, id)`.
+        `query` позволяет добавить фильтры и опции загрузки; сортировку задаёт метод.
+        """
+        query = self.page_query(cursor=cursor, limit=limit, query=query)
+        items = list((await db.execute(query)).scalars().unique().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = cursor_codec.encode(last.created_at, last.id)
+        return Page(items=items, next_cursor=next_cursor)
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = obj_in.model_dump()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._insert_returning(db, obj_in.model_dump())
 
     async def update(
         self, db: AsyncSession, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
@@ -40,17 +152,127 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if isinstance(obj_in, BaseModel):
             update_data = obj_in.model_dump(exclude_unset=True)
 
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_returning(db, db_obj, update_data)
 
     async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
-            await db.commit()
+            await db.flush()
         return obj
+
+    async def _insert_returning(self, db: AsyncSession, values: Dict[str, Any]) -> ModelType:
+        """
+        `INSERT ... RETURNING *`: объект собирается из ответа на сам INSERT,
+        без отдельного SELECT.
+        """
+        statement = insert(self.model).values(**values).returning(self.model)
+        return (await db.scalars(statement)).one()
+
+    async def _update_returning(self, db: AsyncSession, db_obj: ModelType, values: Dict[str, Any]) -> ModelType:
+        """
+        `UPDATE ... WHERE pk = ... RETURNING *`: `db_obj` перезаполняется из ответа
+        (populate_existing), повторное чтение строки не нужно.
+        """
+        if not values:
+            return db_obj
+        mapper = inspect(self.model)
+        identity = mapper.primary_key_from_instance(db_obj)
+        statement = (
+            update(self.model)
+            .where(*(column == value for column, value in zip(mapper.primary_key, identity)))
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(statement)).one()
+
+    @staticmethod
+    def _to_row(obj_in: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(obj_in, BaseModel):
+            return obj_in.model_dump()
+        return dict(obj_in)
+
+    def _chunks(self, rows: List[Dict[str, Any]], chunk_size: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+        size = chunk_size or self.bulk_chunk_size
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    @property
+    def _primary_key_names(self) -> List[str]:
+        return [column.key for column in inspect(self.model).primary_key]
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        chunk_size: Optional[int] = None,
+        ignore_conflicts: bool = False,
+    ) -> List[ModelType]:
+        """
+        Вставляет объекты пачками многострочным `INSERT ... RETURNING`.
+        С `ignore_conflicts=True` дубликаты пропускаются (`ON CONFLICT DO NOTHING`) и не попадают в результат.
+        """
+        rows = [self._to_row(obj_in) for obj_in in objs_in]
+        stmt = pg_insert(self.model)
+        if ignore_conflicts:
+            stmt = stmt.on_conflict_do_nothing()
+        stmt = stmt.returning(self.model)
+
+        created: List[ModelType] = []
+        for chunk in self._chunks(rows, chunk_size):
+            created.extend((await db.scalars(stmt, chunk)).all())
+        return created
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Обновляет строки по первичному ключу (каждый словарь должен его содержать)
+        пакетным `UPDATE ... WHERE pk = ...`. Возвращает число переданных строк.
+        """
+        rows = [dict(obj_in) for obj_in in objs_in]
+        for chunk in self._chunks(rows, chunk_size):
+            await db.execute(update(self.model), chunk)
+        return len(rows)
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[ModelType]:
+        """
+        `INSERT ... ON CONFLICT (index_elements) DO UPDATE ... RETURNING` пачками.
+        По умолчанию конфликт ищется по первичному ключу, а обновляются все переданные
+        поля, кроме ключевых.
+        """
+        rows = [self._to_row(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        conflict_keys = list(index_elements or self._primary_key_names)
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in conflict_keys]
+
+        stmt = pg_insert(self.model)
+        if update_fields:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_keys,
+                set_={field: stmt.excluded[field] for field in update_fields},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_keys)
+        stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+
+        upserted: List[ModelType] = []
+        for chunk in self._chunks(rows, chunk_size):
+            upserted.extend((await db.scalars(stmt, chunk)).all())
+        return upserted
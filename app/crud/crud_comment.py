@@ -1,18 +1,42 @@
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, Page
+from app.crud.crud_post import post as crud_post
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, CommentUpdate
+from sqlalchemy import Select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from typing import Any, Dict, Optional, Union
 from uuid import UUID
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
     async def create_with_author(self, db: AsyncSession, *, obj_in: CommentCreate, author_id: UUID) -> Comment:
-        db_obj = self.model(**obj_in.dict(), authorId=author_id)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        db_obj = await self._insert_returning(db, {**obj_in.model_dump(), "authorId": author_id})
+        await crud_post.adjust_counters(db, post_id=db_obj.postId, comments=1)
         return db_obj
 
+    async def update(
+        self, db: AsyncSession, *, db_obj: Comment, obj_in: Union[CommentUpdate, Dict[str, Any]]
+    ) -> Comment:
+        old_post_id = db_obj.postId
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        db_obj = await self._update_returning(db, db_obj, update_data)
+        if db_obj.postId != old_post_id:
+            # Комментарий перенесён в другой пост
+            await crud_post.adjust_counters(db, post_id=old_post_id, comments=-1)
+            await crud_post.adjust_counters(db, post_id=db_obj.postId, comments=1)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: UUID) -> Optional[UUID]:
+        """
+        Удаляет комментарий одним `DELETE ... RETURNING "postId"` и уменьшает счётчик поста.
+        Возвращает id поста; None — комментария уже нет, счётчик не трогается.
+        """
+        statement = delete(self.model).where(self.model.id == id).returning(self.model.postId)
+        post_id = (await db.execute(statement)).scalar_one_or_none()
+        if post_id is not None:
+            await crud_post.adjust_counters(db, post_id=post_id, comments=-1)
+        return post_id
+
     async def get_multi_by_post(self, db: AsyncSession, *, post_id: UUID, skip: int = 0, limit: int = 100) -> list[Comment]:
         result = await db.execute(
             select(self.model)
@@ -22,4 +46,10 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
         )
         return result.scalars().all()
 
+    def by_post_query(self, *, post_id: UUID) -> Select:
+        return select(self.model).filter(self.model.postId == post_id)
+
+    async def get_page_by_post(self, db: AsyncSession, *, post_id: UUID, cursor: Optional[str] = None, limit: int = 20) -> Page:
+        return await super().get_page(db, cursor=cursor, limit=limit, query=self.by_post_query(post_id=post_id))
+
 comment = CRUDComment(Comment)
@@ -1,86 +1,75 @@
 # app/crud/crud_friend_request.py
 from uuid import UUID
 from typing import Optional, List
-from sqlalchemy import select, or_, and_, delete, func
+from sqlalchemy import Select, select, or_, and_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, OffsetPage, paginate
+from app.crud.crud_friendship import friendship as crud_friendship
 from app.models import FriendRequest, User
 from app.schemas.friend_request import FriendRequestCreate, FriendRequestUpdate
 from app.models.friend_request import FriendRequestStatus
 
 class CRUDFriendRequest(CRUDBase[FriendRequest, FriendRequestCreate, FriendRequestUpdate]):
+    def between_users_query(self, *, requester_id: UUID, receiver_id: UUID) -> Select:
+        """Заявка между двумя пользователями в любую сторону."""
+        return select(self.model).where(
+            or_(
+                and_(self.model.requester_id == requester_id, self.model.receiver_id == receiver_id),
+                and_(self.model.requester_id == receiver_id, self.model.receiver_id == requester_id),
+            )
+        )
+
     async def get_friend_request_by_users(
         self, db: AsyncSession, *, requester_id: UUID, receiver_id: UUID
     ) -> Optional[FriendRequest]:
-        result = await db.execute(
-            select(self.model).where(
-                or_(
-                    and_(self.model.requester_id == requester_id, self.model.receiver_id == receiver_id),
-                    and_(self.model.requester_id == receiver_id, self.model.receiver_id == requester_id),
-                )
-            )
-        )
+        result = await db.execute(self.between_users_query(requester_id=requester_id, receiver_id=receiver_id))
         return result.scalars().first()
 
     async def create_with_requester(
         self, db: AsyncSession, *, obj_in: FriendRequestCreate, requester_id: UUID
     ) -> FriendRequest:
-        db_obj = self.model(receiver_id=obj_in.receiver_id, requester_id=requester_id)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._insert_returning(db, {"receiver_id": obj_in.receiver_id, "requester_id": requester_id})
+
+    def received_query(self, *, user_id: UUID) -> Select:
+        return select(self.model).where(self.model.receiver_id == user_id, self.model.status == FriendRequestStatus.pending)
 
     async def get_received(self, db: AsyncSession, *, user_id: UUID) -> list[FriendRequest]:
-        result = await db.execute(
-            select(self.model).where(self.model.receiver_id == user_id, self.model.status == FriendRequestStatus.pending)
-        )
+        result = await db.execute(self.received_query(user_id=user_id))
         return result.scalars().all()
     
-    async def get_friend_ids(self, db: AsyncSession, *, user_id: UUID) -> List[UUID]:
-        stmt = (
-            select(self.model.requester_id, self.model.receiver_id)
-            .where(
+    async def accept(self, db: AsyncSession, *, db_obj: FriendRequest) -> FriendRequest:
+        """Принимает заявку и записывает дружбу в обе стороны в той же транзакции."""
+        db_obj.status = FriendRequestStatus.accepted
+        await db.flush()
+        await crud_friendship.add(db, user_id=db_obj.requester_id, friend_id=db_obj.receiver_id)
+        return db_obj
+
+    async def unfriend(self, db: AsyncSession, *, user_id: UUID, friend_id: UUID) -> bool:
+        """
+        Удаляет дружбу и принятую заявку между пользователями, чтобы можно было
+        отправить новую. Возвращает False, если они не были друзьями.
+        """
+        removed = await crud_friendship.remove(db, user_id=user_id, friend_id=friend_id)
+        await db.execute(
+            delete(self.model).where(
                 or_(
-                    self.model.requester_id == user_id,
-                    self.model.receiver_id == user_id,
+                    and_(self.model.requester_id == user_id, self.model.receiver_id == friend_id),
+                    and_(self.model.requester_id == friend_id, self.model.receiver_id == user_id),
                 ),
                 self.model.status == FriendRequestStatus.accepted,
             )
         )
+        return removed > 0
 
-        result = await db.execute(stmt)
-        friend_ids = set()
-        for requester_id, receiver_id in result.all():
-            if requester_id == user_id:
-                friend_ids.add(receiver_id)
-            else:
-                friend_ids.add(requester_id)
-        
-        return list(friend_ids)
-
-    async def get_followers_with_total(
-        self, db: AsyncSession, *, user_id: UUID, skip: int, limit: int
-    ) -> tuple[list[User], int]:
-        # Query for total count of followers
-        total_query = (
-            select(func.count(self.model.requester_id))
-            .where(self.model.receiver_id == user_id)
-        )
-        total_result = await db.execute(total_query)
-        total = total_result.scalar_one_or_none() or 0
-
-        # Query for paginated followers' User objects
+    async def get_followers_page(
+        self, db: AsyncSession, *, user_id: UUID, offset: int, limit: int, approximate: bool = False
+    ) -> OffsetPage:
         followers_query = (
             select(User)
             .join(self.model, User.id == self.model.requester_id)
             .where(self.model.receiver_id == user_id)
-            .offset(skip)
-            .limit(limit)
+            .order_by(self.model.created_at.desc(), User.id)
         )
-        followers_result = await db.execute(followers_query)
-        followers = followers_result.scalars().all()
-
-        return followers, total
+        return await paginate(db, followers_query, offset=offset, limit=limit, approximate=approximate)
 
 friend_request = CRUDFriendRequest(FriendRequest)
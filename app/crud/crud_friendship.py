@@ -0,0 +1,61 @@
+# app/crud/crud_friendship.py
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Select, and_, delete, exists, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Friendship, User
+
+
+class CRUDFriendship:
+    """
+    Симметричная таблица дружбы. Методы не фиксируют транзакцию: рёбра пишутся
+    вместе с изменением заявки, которое их вызвало.
+    """
+
+    async def add(
+        self, db: AsyncSession, *, user_id: UUID, friend_id: UUID, since: Optional[datetime] = None
+    ) -> None:
+        since = since or datetime.utcnow()
+        stmt = (
+            pg_insert(Friendship)
+            .values([
+                {"user_id": user_id, "friend_id": friend_id, "since": since},
+                {"user_id": friend_id, "friend_id": user_id, "since": since},
+            ])
+            .on_conflict_do_nothing()
+        )
+        await db.execute(stmt)
+
+    async def remove(self, db: AsyncSession, *, user_id: UUID, friend_id: UUID) -> int:
+        """Удаляет оба направления. Возвращает число удалённых рёбер (0 — не были друзьями)."""
+        result = await db.execute(
+            delete(Friendship).where(
+                or_(
+                    and_(Friendship.user_id == user_id, Friendship.friend_id == friend_id),
+                    and_(Friendship.user_id == friend_id, Friendship.friend_id == user_id),
+                )
+            )
+        )
+        return result.rowcount
+
+    async def are_friends(self, db: AsyncSession, *, user_id: UUID, friend_id: UUID) -> bool:
+        stmt = select(
+            exists().where(Friendship.user_id == user_id, Friendship.friend_id == friend_id)
+        )
+        return bool(await db.scalar(stmt))
+
+    def friends_query(self, *, user_id: UUID) -> Select:
+        """Друзья пользователя как запрос для `paginate`; порядок совпадает с первичным ключом."""
+        return (
+            select(User)
+            .join(Friendship, Friendship.friend_id == User.id)
+            .where(Friendship.user_id == user_id)
+            .order_by(Friendship.friend_id)
+        )
+
+
+friendship = CRUDFriendship()
@@ -2,40 +2,40 @@ from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, insert, select, update
 from app.models.invitation import Invitation
 from app.schemas.invitation import InvitationCreate
 
 class CRUDInvitation:
     async def create_invitation(self, db: AsyncSession, obj_in: InvitationCreate) -> Invitation:
-        inv = Invitation(user_id=obj_in.user_id, team_id=obj_in.team_id, status='pending')
-        db.add(inv)
-        await db.flush()           
-        await db.commit()
-        await db.refresh(inv)      
-        return inv
+        stmt = (
+            insert(Invitation)
+            .values(user_id=obj_in.user_id, team_id=obj_in.team_id, status='pending')
+            .returning(Invitation)
+        )
+        return (await db.scalars(stmt)).one()
+
+    def user_invitations_query(self, user_id: UUID) -> Select:
+        return select(Invitation).where(Invitation.user_id == user_id)
 
     async def get_user_invitations(self, db: AsyncSession, user_id: UUID) -> List[Invitation]:
-        stmt = select(Invitation).where(Invitation.user_id == user_id)
-        res = await db.execute(stmt)
+        res = await db.execute(self.user_invitations_query(user_id))
         return list(res.scalars().all())
 
+    async def _set_status(self, db: AsyncSession, invitation_id: UUID, status: str) -> Optional[Invitation]:
+        stmt = (
+            update(Invitation)
+            .where(Invitation.id == invitation_id)
+            .values(status=status)
+            .returning(Invitation)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(stmt)).one_or_none()
+
     async def accept(self, db: AsyncSession, invitation_id: UUID) -> Optional[Invitation]:
-        inv = await db.get(Invitation, invitation_id)
-        if not inv:
-            return None
-        inv.status = 'accepted'
-        await db.commit()
-        await db.refresh(inv)
-        return inv
+        return await self._set_status(db, invitation_id, 'accepted')
 
     async def decline(self, db: AsyncSession, invitation_id: UUID) -> Optional[Invitation]:
-        inv = await db.get(Invitation, invitation_id)
-        if not inv:
-            return None
-        inv.status = 'declined'
-        await db.commit()
-        await db.refresh(inv)
-        return inv
+        return await self._set_status(db, invitation_id, 'declined')
 
 invitation = CRUDInvitation()
\ No newline at end of file
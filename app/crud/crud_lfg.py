@@ -1,15 +1,13 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, Page
 from app.models.lfg import LFG
 from app.schemas.lfg import LFGCreate, LFGUpdate
 
 
 class CRUDLFG(CRUDBase[LFG, LFGCreate, LFGUpdate]):
-    async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, type: Optional[str] = None, sport_id: Optional[int] = None, role: Optional[str] = None
-    ) -> List[LFG]:
+    def _filtered(self, type: Optional[str], sport_id: Optional[int], role: Optional[str]):
         query = select(self.model)
         if type:
             query = query.where(self.model.type == type)
@@ -17,17 +15,23 @@ class CRUDLFG(CRUDBase[LFG, LFGCreate, LFGUpdate]):
             query = query.where(self.model.sport_id == sport_id)
         if role:
             query = query.where(self.model.role == role)
+        return query
+
+    async def get_page(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 20, type: Optional[str] = None, sport_id: Optional[int] = None, role: Optional[str] = None
+    ) -> Page:
+        query = self._filtered(type, sport_id, role)
+        return await super().get_page(db, cursor=cursor, limit=limit, query=query)
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, type: Optional[str] = None, sport_id: Optional[int] = None, role: Optional[str] = None
+    ) -> List[LFG]:
+        query = self._filtered(type, sport_id, role)
         result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
     
     async def create(self, db: AsyncSession, *, obj_in: LFGCreate, creator_id: int) -> LFG:
-        obj_in_data = obj_in.dict()
-        obj_in_data['creator_id'] = creator_id
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._insert_returning(db, {**obj_in.model_dump(), "creator_id": creator_id})
 
 
 lfg = CRUDLFG(LFG)
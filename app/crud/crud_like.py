@@ -1,28 +1,56 @@
+from sqlalchemy import Select, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.crud.base import CRUDBase
+from app.crud.crud_post import post as crud_post
 from app.models import Like, Post
+from typing import Optional
 from app.schemas.like import LikeCreate, LikeUpdate
 from fastapi.encoders import jsonable_encoder
 import uuid
 
 
+def _by_user_and_post(user_id: uuid.UUID, post_id: uuid.UUID):
+    return lambda_stmt(lambda: select(Like).where(Like.user_id == user_id, Like.post_id == post_id))
+
+
 class CRUDLike(CRUDBase[Like, LikeCreate, LikeUpdate]):
+    async def create(self, db: AsyncSession, *, obj_in: LikeCreate) -> Like:
+        db_obj = await self._insert_returning(db, obj_in.model_dump())
+        await crud_post.adjust_counters(db, post_id=db_obj.post_id, likes=1)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: uuid.UUID) -> Optional[uuid.UUID]:
+        """
+        Удаляет лайк одним `DELETE ... RETURNING post_id` и уменьшает счётчик поста.
+        Возвращает post_id; None — лайка уже нет (например, его удалил параллельный запрос),
+        тогда счётчик не трогается.
+        """
+        post_id = (await db.execute(delete(Like).where(Like.id == id).returning(Like.post_id))).scalar_one_or_none()
+        if post_id is not None:
+            await crud_post.adjust_counters(db, post_id=post_id, likes=-1)
+        return post_id
+
     async def create_with_user_and_post(self, db: AsyncSession, *, obj_in: LikeCreate, user_id: uuid.UUID, post_id: uuid.UUID) -> Like:
         obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data, user_id=user_id, post_id=post_id)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        db_obj = await self._insert_returning(db, {**obj_in_data, "user_id": user_id, "post_id": post_id})
+        await crud_post.adjust_counters(db, post_id=db_obj.post_id, likes=1)
         return db_obj
 
+    def by_user_and_post_query(self, *, user_id: uuid.UUID, post_id: uuid.UUID):
+        return _by_user_and_post(user_id, post_id)
+
     async def get_by_user_and_post(self, db: AsyncSession, *, user_id: uuid.UUID, post_id: uuid.UUID) -> Like | None:
-        result = await db.execute(select(self.model).filter(self.model.user_id == user_id, self.model.post_id == post_id))
+        result = await db.execute(self.by_user_and_post_query(user_id=user_id, post_id=post_id))
         return result.scalars().first()
 
+    def like_count_query(self, *, post_id: uuid.UUID) -> Select:
+        # Денормализованный счётчик поста, а не count() по likes
+        return select(Post.like_count).where(Post.id == post_id)
+
     async def get_like_count_for_post(self, db: AsyncSession, *, post_id: uuid.UUID) -> int:
-        result = await db.execute(select(self.model).filter(self.model.post_id == post_id))
-        return len(result.scalars().all())
+        result = await db.execute(self.like_count_query(post_id=post_id))
+        return result.scalar_one_or_none() or 0
 
     async def get_liked_posts_by_user(self, db: AsyncSession, *, user_id: uuid.UUID) -> list[Post]:
         result = await db.execute(
@@ -1,14 +1,16 @@
 # app/crud/crud_notification.py
-from sqlalchemy import select, desc
+from sqlalchemy import Select, select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Notification
 import uuid
 
-async def get_notifications_for_user(db: AsyncSession, user_id: uuid.UUID):
-    stmt = (
+def notifications_for_user_query(user_id: uuid.UUID) -> Select:
+    return (
         select(Notification)
         .where(Notification.user_id == user_id)
         .order_by(desc(Notification.created_at))
     )
-    res = await db.execute(stmt)
+
+async def get_notifications_for_user(db: AsyncSession, user_id: uuid.UUID):
+    res = await db.execute(notifications_for_user_query(user_id))
     return [row[0] for row in res.all()]
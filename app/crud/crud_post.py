@@ -1,16 +1,101 @@
+from typing import Optional
+
 from app.crud.base import CRUDBase
+from app.models import Comment, Like
 from app.models.post import Post
 from app.schemas.post import PostCreate, PostUpdate
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from uuid import UUID
 
+# Ключ pg_try_advisory_xact_lock для сверки счётчиков (см. `try_lock_counter_reconcile`)
+COUNTER_RECONCILE_LOCK_KEY = 0x706F7374
+
+
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
+    def _version_columns(self) -> list:
+        # Счётчики меняются без updated_at, но входят в ответ
+        return [self.model.updated_at, self.model.like_count, self.model.comment_count]
+
     async def create_with_author(self, db: AsyncSession, *, obj_in: PostCreate, author_id: UUID) -> Post:
-        db_obj = self.model(**obj_in.dict(), author_id=author_id)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._insert_returning(db, {**obj_in.model_dump(), "author_id": author_id})
+
+    async def adjust_counters(
+        self, db: AsyncSession, *, post_id: UUID, likes: int = 0, comments: int = 0
+    ) -> None:
+        """Сдвигает счётчики поста в текущей транзакции; фиксирует вызывающий код."""
+        values = {}
+        if likes:
+            values["like_count"] = self.model.like_count + likes
+        if comments:
+            values["comment_count"] = self.model.comment_count + comments
+        if not values:
+            return
+        await db.execute(
+            update(self.model)
+            .where(self.model.id == post_id)
+            # Счётчики — не правка поста: updated_at не трогаем
+            .values(**values, updated_at=self.model.updated_at)
+        )
+
+    async def try_lock_counter_reconcile(self, db: AsyncSession) -> bool:
+        """
+        Транзакционная advisory-блокировка сверки счётчиков: из всех воркеров пачку
+        сверяет тот, кто её получил. Снимается при фиксации или откате.
+        """
+        return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(COUNTER_RECONCILE_LOCK_KEY))))
+
+    async def reconcile_counters_batch(
+        self, db: AsyncSession, *, after_id: Optional[UUID], batch_size: int
+    ) -> tuple[Optional[UUID], int]:
+        """
+        Пересчитывает счётчики для следующих `batch_size` постов по id и исправляет расхождения.
+        Возвращает последний обработанный id (None — посты закончились) и число исправленных постов.
+
+        Посты пачки сначала блокируются (`FOR UPDATE`), и только потом отдельным запросом
+        считаются лайки и комментарии: к этому моменту транзакции, уже сдвинувшие счётчики,
+        зафиксированы и видны в новом снимке, а новые ждут блокировки и сдвинут уже исправленное значение.
+        """
+        locked_query = (
+            select(self.model.id, self.model.like_count, self.model.comment_count)
+            .order_by(self.model.id)
+            .limit(batch_size)
+            .with_for_update()
+        )
+        if after_id is not None:
+            locked_query = locked_query.where(self.model.id > after_id)
+        locked = (await db.execute(locked_query)).all()
+        if not locked:
+            return None, 0
+
+        ids = [row.id for row in locked]
+        likes = dict((await db.execute(
+            select(Like.post_id, func.count()).where(Like.post_id.in_(ids)).group_by(Like.post_id)
+        )).all())
+        comments = dict((await db.execute(
+            select(Comment.postId, func.count()).where(Comment.postId.in_(ids)).group_by(Comment.postId)
+        )).all())
+
+        drifted = [
+            {"post_id": row.id, "likes": likes.get(row.id, 0), "comments": comments.get(row.id, 0)}
+            for row in locked
+            if (row.like_count, row.comment_count) != (likes.get(row.id, 0), comments.get(row.id, 0))
+        ]
+        if drifted:
+            table = self.model.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("post_id"))
+                .values(
+                    like_count=bindparam("likes"),
+                    comment_count=bindparam("comments"),
+                    # Счётчики — не правка поста: updated_at не трогаем
+                    updated_at=table.c.updated_at,
+                ),
+                drifted,
+            )
+        return ids[-1], len(drifted)
+
 
 post = CRUDPost(Post)
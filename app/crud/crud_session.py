@@ -1,15 +1,132 @@
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import Select, delete, func, lambda_stmt, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
-from app.models import Session
+from app.models import Session, User
 from app.schemas.session import SessionCreate, SessionUpdate
 
 
+def _by_refresh_token_hash(refresh_token_hash: bytes):
+    return lambda_stmt(lambda: select(Session).where(Session.refresh_token_hash == refresh_token_hash))
+
+
 class CRUDSession(CRUDBase[Session, SessionCreate, SessionUpdate]):
-    async def get_by_refresh_token(self, db: AsyncSession, *, refresh_token: str) -> Session | None:
-        statement = select(self.model).where(self.model.refresh_token == refresh_token)
+    def by_refresh_token_hash_query(self, *, refresh_token_hash: bytes):
+        return _by_refresh_token_hash(refresh_token_hash)
+
+    async def get_by_refresh_token_hash(self, db: AsyncSession, *, refresh_token_hash: bytes) -> Session | None:
+        statement = self.by_refresh_token_hash_query(refresh_token_hash=refresh_token_hash)
         return (await db.execute(statement)).scalar_one_or_none()
 
+    async def rotate(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        old_hash: bytes,
+        new_hash: bytes,
+        expires_at: datetime,
+        user_agent: str,
+        ip_address: str,
+    ) -> int | None:
+        """
+        Атомарно заменяет refresh-токен живой сессии одним `UPDATE ... RETURNING`.
+        Возвращает текущий `token_version` пользователя или None, если токен не найден или истёк.
+        """
+        statement = (
+            update(self.model)
+            .where(
+                self.model.refresh_token_hash == old_hash,
+                self.model.user_id == user_id,
+                self.model.expires_at > func.now(),
+            )
+            .values(
+                refresh_token_hash=new_hash,
+                previous_token_hash=old_hash,
+                rotated_at=func.now(),
+                expires_at=expires_at,
+                user_agent=user_agent,
+                ip_address=ip_address,
+                updated_at=func.now(),
+            )
+            .returning(
+                select(User.token_version).where(User.id == self.model.user_id).scalar_subquery()
+            )
+        )
+        return (await db.execute(statement)).scalar_one_or_none()
+
+    async def revoke_reused(
+        self, db: AsyncSession, *, refresh_token_hash: bytes, grace_seconds: int
+    ) -> UUID | None:
+        """
+        Удаляет сессию, если предъявлен уже ротированный токен (признак кражи).
+        Если ротация была не раньше `grace_seconds` назад, сессия не трогается: так выглядят
+        параллельные refresh одним токеном и ретрай клиента, не получившего ответ.
+        Возвращает user_id удалённой сессии.
+        """
+        statement = (
+            delete(self.model)
+            .where(
+                self.model.previous_token_hash == refresh_token_hash,
+                or_(
+                    self.model.rotated_at.is_(None),
+                    self.model.rotated_at < func.now() - timedelta(seconds=grace_seconds),
+                ),
+            )
+            .returning(self.model.user_id)
+        )
+        return (await db.execute(statement)).scalar_one_or_none()
+
+    async def create_with_cap(self, db: AsyncSession, *, obj_in: SessionCreate, max_sessions: int) -> Session:
+        """
+        Создает сессию и в той же транзакции удаляет живые сессии пользователя сверх `max_sessions`,
+        дольше всех не ротировавшиеся (по `updated_at`). Истёкшие, ещё не убранные
+        `SessionReaper`, в лимит не входят. `max_sessions <= 0` отключает ограничение.
+        """
+        db_obj = self.model(**obj_in.model_dump())
+        db.add(db_obj)
+        await db.flush()
+        if max_sessions > 0:
+            excess = self.excess_sessions_query(user_id=obj_in.user_id, max_sessions=max_sessions)
+            await db.execute(delete(self.model).where(self.model.id.in_(excess)))
+        return db_obj
+
+    def excess_sessions_query(self, *, user_id: UUID, max_sessions: int) -> Select:
+        """id живых сессий пользователя сверх `max_sessions`, от давно не ротировавшихся (индекс `(user_id, updated_at)`)."""
+        return (
+            select(self.model.id)
+            .where(self.model.user_id == user_id, self.model.expires_at > func.now())
+            .order_by(self.model.updated_at.desc(), self.model.id.desc())
+            .offset(max_sessions)
+        )
+
+    async def remove_all_for_user(self, db: AsyncSession, *, user_id: UUID) -> int:
+        result = await db.execute(delete(self.model).where(self.model.user_id == user_id))
+        return result.rowcount
+
+    async def remove_expired_batch(self, db: AsyncSession, *, batch_size: int) -> int:
+        """
+        Удаляет не больше `batch_size` истёкших сессий.
+        SKIP LOCKED позволяет нескольким воркерам чистить таблицу параллельно.
+        """
+        expired = (
+            select(self.model.id)
+            .where(self.model.expires_at < func.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def remove_by_refresh_token_hash(self, db: AsyncSession, *, refresh_token_hash: bytes) -> None:
+        await db.execute(delete(self.model).where(self.model.refresh_token_hash == refresh_token_hash))
+
 
 session = CRUDSession(Session)
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, lambda_stmt
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,14 +10,18 @@ from app.models import team_followers
 from app.models.subscription import Subscription
 
 
-async def is_subscribed(db: AsyncSession, user_id: UUID, team_id: UUID) -> bool:
-    result = await db.execute(
-        select(team_followers).where(
+def _subscription(user_id: UUID, team_id: UUID):
+    return lambda_stmt(
+        lambda: select(team_followers).where(
             team_followers.c.user_id == user_id,
             team_followers.c.team_id == team_id,
         )
     )
-    return result.scalar_one_or_none() is not None
+
+
+async def is_subscribed(db: AsyncSession, user_id: UUID, team_id: UUID) -> bool:
+    result = await db.execute(_subscription(user_id, team_id))
+    return result.first() is not None
 
 
 async def subscribe(db: AsyncSession, user_id: UUID, team_id: UUID) -> None:
@@ -27,7 +31,6 @@ async def subscribe(db: AsyncSession, user_id: UUID, team_id: UUID) -> None:
         .on_conflict_do_nothing(index_elements=["user_id", "team_id"])
     )
     await db.execute(stmt)
-    await db.commit()
 
 
 async def unsubscribe(db: AsyncSession, user_id: UUID, team_id: UUID) -> int:
@@ -37,7 +40,6 @@ async def unsubscribe(db: AsyncSession, user_id: UUID, team_id: UUID) -> int:
             team_followers.c.team_id == team_id,
         )
     )
-    await db.commit()
     return result.rowcount
 
 
@@ -1,25 +1,88 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.crud.base import CRUDBase
+from app.core.team_cache import TeamAccess, team_cache
+from app.crud.base import CRUDBase, Page
+from app.db.unit_of_work import on_commit
 from app.models.team import Team
 from app.models.team_application import TeamApplication
 from app.models.user_team import UserTeam
 from app.models.subscription import Subscription
 from app.schemas.team import TeamCreate, TeamUpdate
 from fastapi import HTTPException
-from sqlalchemy import delete, select, and_
-from sqlalchemy.orm import selectinload
-from typing import Any, List, Optional
+from app.models.user import User
+from sqlalchemy import Select, delete, func, select, and_, lambda_stmt
+from sqlalchemy.orm import aliased, selectinload
+from typing import Any, List, Optional, Tuple
+
+
+def _with_members(team_id: Any):
+    return lambda_stmt(
+        lambda: select(Team).where(Team.id == team_id).options(
+            selectinload(Team.member_associations).selectinload(UserTeam.user)
+        )
+    )
 
 
 class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
     async def get(self, db: AsyncSession, id: Any) -> Optional[Team]:
-        query = select(self.model).where(self.model.id == id).options(
-            selectinload(self.model.member_associations).selectinload(UserTeam.user)
-        )
-        result = await db.execute(query)
+        result = await db.execute(_with_members(id))
         return result.scalar_one_or_none()
 
+    async def get_access(self, db: AsyncSession, team_id: Any) -> Optional[TeamAccess]:
+        """
+        Владелец и id участников команды (через `team_cache`) — для проверок прав
+        без загрузки профилей. None, если команды нет.
+        """
+        async def load() -> Optional[TeamAccess]:
+            statement = (
+                select(
+                    self.model.owner_id,
+                    func.array_agg(UserTeam.user_id).filter(UserTeam.user_id.isnot(None)),
+                )
+                .outerjoin(UserTeam, UserTeam.team_id == self.model.id)
+                .where(self.model.id == team_id)
+                .group_by(self.model.id)
+            )
+            row = (await db.execute(statement)).first()
+            if row is None:
+                return None
+            return TeamAccess(row[0], frozenset(row[1] or ()))
+
+        return await team_cache.get_access(team_id, load)
+
+    async def _check_owner(self, db: AsyncSession, team_id: UUID, owner_id: UUID, detail: str = "Not authorized") -> TeamAccess:
+        access = await self.get_access(db, team_id)
+        if access is None or access.owner_id != owner_id:
+            raise HTTPException(status_code=403, detail=detail)
+        return access
+
+    def _invalidate_on_commit(self, db: AsyncSession, team_id: UUID) -> None:
+        # Состав изменился: сбрасываем доступ и тела ответов после фиксации
+        on_commit(db, lambda: team_cache.invalidate(team_id))
+
+    async def get_version(self, db: AsyncSession, id: Any) -> Optional[Tuple[Any, ...]]:
+        """
+        Версия команды вместе с владельцем и участниками: число участников и самые
+        поздние updated_at участия и профилей — одним агрегатом вместо загрузки состава.
+        """
+        owner = aliased(User)
+        statement = (
+            select(
+                self.model.updated_at,
+                owner.updated_at,
+                func.count(UserTeam.user_id),
+                func.max(UserTeam.updated_at),
+                func.max(User.updated_at),
+            )
+            .outerjoin(owner, owner.id == self.model.owner_id)
+            .outerjoin(UserTeam, UserTeam.team_id == self.model.id)
+            .outerjoin(User, User.id == UserTeam.user_id)
+            .where(self.model.id == id)
+            .group_by(self.model.id, owner.id)
+        )
+        row = (await db.execute(statement)).first()
+        return None if row is None else tuple(row)
+
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[Team]:
@@ -29,18 +92,24 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
         result = await db.execute(query)
         return result.scalars().unique().all()
     
+    async def get_page(self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 20) -> Page:
+        query = select(self.model).options(
+            selectinload(self.model.member_associations).selectinload(UserTeam.user)
+        )
+        return await super().get_page(db, cursor=cursor, limit=limit, query=query)
+
     async def create_with_owner(self, db: AsyncSession, *, obj_in: TeamCreate, owner_id: UUID) -> Team:
         """ 
         Создает команду и делает пользователя владельцем
         """
         db_obj = self.model(**obj_in.dict(), owner_id=owner_id)
         db.add(db_obj)
-        await db.commit()
+        await db.flush()
 
-        # Add owner as a team member
+        # Add owner as a team member (уходит в БД автосбросом перед запросом ниже)
         owner_member = UserTeam(user_id=owner_id, team_id=db_obj.id)
         db.add(owner_member)
-        await db.commit()
+        self._invalidate_on_commit(db, db_obj.id)
 
         # Re-fetch the team with members eagerly loaded to satisfy the response_model and avoid MissingGreenlet
         query = select(Team).where(Team.id == db_obj.id).options(
@@ -51,13 +120,12 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
 
     async def apply(self, db: AsyncSession, *, team_id: UUID, user_id: UUID):
         # Проверяем, что команда существует
-        team = await self.get(db, team_id)
-        if not team:
+        access = await self.get_access(db, team_id)
+        if access is None:
             raise HTTPException(status_code=404, detail="Team not found")
         
         # Проверяем, что пользователь уже не в команде
-        member_query = await db.execute(select(UserTeam).where(UserTeam.team_id == team_id, UserTeam.user_id == user_id))
-        if member_query.scalars().first():
+        if access.is_member(user_id):
             raise HTTPException(status_code=400, detail="User is already in the team")
 
         # Проверяем, что пользователь еще не подал заявку
@@ -68,20 +136,19 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
         # Создаем заявку
         application = TeamApplication(team_id=team_id, user_id=user_id)
         db.add(application)
-        await db.commit()
+        await db.flush()
 
     async def list_applications(self, db: AsyncSession, *, team_id: UUID, owner_id: UUID):
-        team = await self.get(db, team_id)
-        if not team or team.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+        await self._check_owner(db, team_id, owner_id)
         
-        applications_query = await db.execute(select(TeamApplication).where(TeamApplication.team_id == team_id).options(selectinload(TeamApplication.user)))
+        applications_query = await db.execute(self.applications_query(team_id=team_id))
         return applications_query.scalars().all()
 
+    def applications_query(self, *, team_id: UUID) -> Select:
+        return select(TeamApplication).where(TeamApplication.team_id == team_id).options(selectinload(TeamApplication.user))
+
     async def accept(self, db: AsyncSession, *, team_id: UUID, owner_id: UUID, user_id: UUID):
-        team = await self.get(db, team_id)
-        if not team or team.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+        await self._check_owner(db, team_id, owner_id)
 
         # Находим и удаляем заявку
         application_query = await db.execute(select(TeamApplication).where(TeamApplication.team_id == team_id, TeamApplication.user_id == user_id))
@@ -94,12 +161,11 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
         # Добавляем в команду
         new_member = UserTeam(team_id=team_id, user_id=user_id)
         db.add(new_member)
-        await db.commit()
+        await db.flush()
+        self._invalidate_on_commit(db, team_id)
 
     async def decline(self, db: AsyncSession, *, team_id: UUID, owner_id: UUID, user_id: UUID):
-        team = await self.get(db, team_id)
-        if not team or team.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+        await self._check_owner(db, team_id, owner_id)
 
         # Находим и удаляем заявку
         application_query = await db.execute(select(TeamApplication).where(TeamApplication.team_id == team_id, TeamApplication.user_id == user_id))
@@ -108,22 +174,17 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
             raise HTTPException(status_code=404, detail="Application not found")
         
         await db.delete(application)
-        await db.commit()
+        await db.flush()
 
     async def update_logo(self, db: AsyncSession, *, team_id: UUID, owner_id: UUID, logo_url: str) -> Team:
-        team = await self.get(db, team_id)
-        if not team or team.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+        await self._check_owner(db, team_id, owner_id)
 
-        team.logoUrl = logo_url
-        await db.commit()
-        await db.refresh(team)
-        return team
+        team = await self.get(db, team_id)
+        # populate_existing перезаписывает только колонки, загруженные участники остаются
+        return await self._update_returning(db, team, {"logoUrl": logo_url})
 
     async def remove_member(self, db: AsyncSession, *, team_id: UUID, owner_id: UUID, user_id: UUID):
-        team = await self.get(db, team_id)
-        if not team or team.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="Not authorized to remove members")
+        await self._check_owner(db, team_id, owner_id, detail="Not authorized to remove members")
 
         if owner_id == user_id:
             raise HTTPException(status_code=400, detail="Owner cannot remove themselves")
@@ -132,8 +193,7 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
         member_query = await db.execute(delete(UserTeam).where(UserTeam.team_id == team_id, UserTeam.user_id == user_id))
         if member_query.rowcount == 0:
             raise HTTPException(status_code=404, detail="Member not found in the team")
-            
-        await db.commit()
+        self._invalidate_on_commit(db, team_id)
 
     async def toggle_follow(self, db: AsyncSession, *, team_id: UUID, user_id: UUID) -> bool:
         result = await db.execute(
@@ -145,12 +205,12 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
 
         if subscription:
             await db.delete(subscription)
-            await db.commit()
+            await db.flush()
             return False
         else:
             new_sub = Subscription(user_id=user_id, team_id=team_id)
             db.add(new_sub)
-            await db.commit()
+            await db.flush()
             return True
 
 team = CRUDTeam(Team)
@@ -1,11 +1,11 @@
 # app/crud/crud_user.py
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, lambda_stmt, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, OffsetPage, paginate
 from app.models import User, Team, team_followers
 from app.models.friend_request import FriendRequest, FriendRequestStatus
 from app.models.subscription import Subscription
@@ -13,51 +13,60 @@ from app.models.user_team import UserTeam
 from app.schemas.user import UserCreate, UserCreateDB, UserUpdate
 from app.core.security import get_password_hash, verify_password
 
+# Горячие запросы собираются через lambda_stmt: SQL и ключ кеша компиляции
+# строятся один раз на место в коде, а на вызов остаётся только подстановка параметров.
+def _by_email(email: str):
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
+def _token_version(user_id: UUID):
+    return lambda_stmt(lambda: select(User.token_version).where(User.id == user_id))
+
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def by_email_query(self, *, email: str):
+        return _by_email(email)
+
     async def get_by_email(self, db: AsyncSession, *, email: str) -> User | None:
-        statement = select(self.model).where(self.model.email == email)
+        return (await db.execute(self.by_email_query(email=email))).scalar_one_or_none()
+
+    async def get_token_version(self, db: AsyncSession, *, user_id: UUID) -> int | None:
+        return (await db.execute(_token_version(user_id))).scalar_one_or_none()
+
+    async def bump_token_version(self, db: AsyncSession, *, user_id: UUID) -> int | None:
+        """Атомарно увеличивает token_version, делая недействительными все выданные access-токены."""
+        statement = (
+            update(self.model)
+            .where(self.model.id == user_id)
+            .values(token_version=self.model.token_version + 1)
+            .returning(self.model.token_version)
+        )
         return (await db.execute(statement)).scalar_one_or_none()
 
     async def get_many_by_ids(self, db: AsyncSession, *, ids: list[UUID]) -> list[User]:
         statement = select(self.model).where(self.model.id.in_(ids))
         return (await db.execute(statement)).scalars().all()
 
-    async def get_following_with_total(
-        self, db: AsyncSession, *, user_id: UUID, skip: int, limit: int
-    ) -> tuple[list[Team], int]:
-        # Запрос для получения команд, на которые подписан пользователь
+    async def get_following_page(
+        self, db: AsyncSession, *, user_id: UUID, offset: int, limit: int, approximate: bool = False
+    ) -> OffsetPage:
+        # Команды, на которые подписан пользователь
         query = (
             select(Team)
             .join(team_followers, Team.id == team_followers.c.team_id)  # Explicit join condition
             .where(team_followers.c.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        teams_result = await db.execute(query)
-        teams = teams_result.scalars().all()
-
-        # Запрос для получения общего количества подписок
-        total_query = (
-            select(func.count())
-            .select_from(team_followers)
-            .where(team_followers.c.user_id == user_id)
+            .order_by(Team.id)
         )
-        total = await db.scalar(total_query)
-
-        return teams, total or 0
+        return await paginate(db, query, offset=offset, limit=limit, approximate=approximate)
 
     async def create(self, db: AsyncSession, *, obj_in: UserCreateDB) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            nickname=obj_in.nickname,
-            first_name=obj_in.first_name,
-            last_name=obj_in.last_name,
-            birth_date=obj_in.birth_date,
-            hashed_password=obj_in.password, 
-        )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._insert_returning(db, {
+            "email": obj_in.email,
+            "nickname": obj_in.nickname,
+            "first_name": obj_in.first_name,
+            "last_name": obj_in.last_name,
+            "birth_date": obj_in.birth_date,
+            "hashed_password": obj_in.password,
+        })
 
 user = CRUDUser(User)
@@ -25,7 +25,6 @@ async def subscribe(db: AsyncSession, *, user_id: UUID, team_id: UUID) -> None:
         .on_conflict_do_nothing(index_elements=["user_id", "team_id"])
     )
     await db.execute(stmt)
-    await db.commit()
 
 
 async def unsubscribe(db: AsyncSession, *, user_id: UUID, team_id: UUID) -> int:
@@ -33,7 +32,6 @@ async def unsubscribe(db: AsyncSession, *, user_id: UUID, team_id: UUID) -> int:
         Subscription.user_id == user_id, Subscription.team_id == team_id
     )
     res = await db.execute(stmt)
-    await db.commit()
     return res.rowcount
 
 
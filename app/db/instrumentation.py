@@ -0,0 +1,80 @@
+# app/db/instrumentation.py
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    """SQL-статистика одного HTTP-запроса."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    shapes: Counter = field(default_factory=Counter)
+    scope: Optional[Dict[str, Any]] = None
+
+    @property
+    def route(self) -> str:
+        # Шаблон пути (`/api/v1/teams/{team_id}`), а не сам путь — иначе метки не ограничены
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", "unmatched")
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[statement] += 1
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Запросы одной формы, выполненные не меньше `threshold` раз — вероятный N+1."""
+        return [(statement, n) for statement, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def start_request_stats(scope: Optional[Dict[str, Any]] = None) -> QueryStats:
+    stats = QueryStats(scope=scope)
+    _current_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+    # Для слушателей, подключённых после этого (см. app.db.slow_query)
+    conn.info["last_query_seconds"] = seconds
+    stats = _current_stats.get()
+    if stats is not None:
+        # Текст с плейсхолдерами одинаков для всех значений параметров — это и есть «форма» запроса
+        stats.record(statement, seconds)
+
+
+def _handle_error(exception_context):
+    # Выполнение упало — after_cursor_execute не вызовется, снимаем отметку времени сами
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Подключает учёт запросов к синхронному ядру движка (`AsyncEngine.sync_engine`)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
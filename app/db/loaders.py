@@ -0,0 +1,133 @@
+# app/db/loaders.py
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.team import Team
+from app.models.user import User
+from app.models.user_team import UserTeam
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Ключ в `session.info`, под которым живёт реестр загрузчиков сессии
+LOADERS = "loaders"
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Пакетная загрузка по ключу с дедупликацией в пределах сессии.
+
+    Ключи, запрошенные за один проход цикла событий (например, из `asyncio.gather`),
+    уходят в `batch_load` одним вызовом; повторный `load` того же ключа возвращает
+    уже полученный объект без запроса. Отсутствующий ключ даёт None. Ошибка
+    `batch_load` не кешируется: следующий `load` повторит попытку.
+    """
+
+    def __init__(self, batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self._batch_load = batch_load
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Пакет отправляется на следующем проходе цикла, когда соседние задачи успеют добавить ключи
+                loop.call_soon(self._schedule_dispatch)
+        # Отмена ожидающего не должна отменять общий результат
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Кладёт уже загруженный объект, чтобы последующий `load` обошёлся без запроса."""
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: K) -> None:
+        future = self._futures.get(key)
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def _schedule_dispatch(self) -> None:
+        self._dispatch_task = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            values = await self._batch_load(keys)
+        except BaseException as exc:
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                    future.exception()  # ожидающих может не быть — не пишем "exception was never retrieved"
+                else:
+                    future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+        else:
+            for key in keys:
+                future = self._futures.get(key)
+                if future is not None and not future.done():
+                    future.set_result(values.get(key))
+
+
+class Loaders:
+    """
+    Загрузчики пользователей и команд одной сессии (одного запроса).
+
+    AsyncSession не допускает параллельных запросов, поэтому пакеты разных
+    загрузчиков выполняются по очереди под общим замком. Команда грузится вместе
+    с владельцем и участниками, и они сразу попадают в загрузчик пользователей.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+        self._lock = asyncio.Lock()
+        self.users: DataLoader[UUID, User] = DataLoader(self._load_users)
+        self.teams: DataLoader[UUID, Team] = DataLoader(self._load_teams)
+
+    async def _load_users(self, ids: List[UUID]) -> Dict[UUID, User]:
+        async with self._lock:
+            result = await self._db.execute(select(User).where(User.id.in_(ids)))
+        return {user.id: user for user in result.scalars()}
+
+    async def _load_teams(self, ids: List[UUID]) -> Dict[UUID, Team]:
+        async with self._lock:
+            result = await self._db.execute(
+                select(Team)
+                .where(Team.id.in_(ids))
+                .options(
+                    selectinload(Team.owner),
+                    selectinload(Team.member_associations).selectinload(UserTeam.user),
+                )
+            )
+            teams = result.scalars().all()
+        for team in teams:
+            self.users.prime(team.owner.id, team.owner)
+            for association in team.member_associations:
+                self.users.prime(association.user.id, association.user)
+        return {team.id: team for team in teams}
+
+
+def loaders_for(db: AsyncSession) -> Loaders:
+    """Реестр загрузчиков сессии; создаётся при первом обращении и живёт вместе с ней."""
+    loaders = db.info.get(LOADERS)
+    if loaders is None:
+        loaders = db.info[LOADERS] = Loaders(db)
+    return loaders
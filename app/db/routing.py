@@ -0,0 +1,54 @@
+# app/db/routing.py
+import time
+from typing import Dict
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+class ReadYourWritesPins:
+    """
+    Короткоживущие метки "пользователь только что писал".
+
+    Пока метка жива, чтения пользователя идут в primary, а не в реплику,
+    чтобы он сразу видел свои изменения несмотря на лаг репликации.
+    С backend "redis" метка видна всем воркерам, с "memory" — только своему
+    (поэтому "memory" допустим лишь с одним воркером). Без реплики метки не ставятся.
+    """
+
+    def __init__(self, ttl_seconds: float, use_redis: bool, enabled: bool = True, max_local: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.enabled = enabled
+        self.max_local = max_local
+        self._local: Dict[UUID, float] = {}
+
+    @staticmethod
+    def _redis_key(user_id: UUID) -> str:
+        return f"db:pin_primary:{user_id}"
+
+    async def pin(self, user_id: UUID) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if len(self._local) >= self.max_local:
+            self._local = {uid: exp for uid, exp in self._local.items() if exp > now}
+        self._local[user_id] = now + self.ttl_seconds
+        if self.use_redis:
+            await get_redis().set(self._redis_key(user_id), 1, px=int(self.ttl_seconds * 1000))
+
+    async def is_pinned(self, user_id: UUID) -> bool:
+        expires_at = self._local.get(user_id)
+        if expires_at is not None and expires_at > time.monotonic():
+            return True
+        if self.use_redis:
+            return bool(await get_redis().exists(self._redis_key(user_id)))
+        return False
+
+
+read_your_writes = ReadYourWritesPins(
+    ttl_seconds=settings.READ_REPLICA_PIN_SECONDS,
+    use_redis=settings.READ_REPLICA_PIN_BACKEND == "redis",
+    enabled=settings.READ_DATABASE_URL is not None,
+)
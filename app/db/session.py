@@ -1,16 +1,118 @@
 # app/db/session.py
+import multiprocessing
+import time
+import uuid
+from dataclasses import dataclass
+
+from prometheus_client import Gauge, Histogram
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from app.core.config import settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.slow_query import slow_query_log
 
 url = str(settings.DATABASE_URL)
 assert "+asyncpg" in url, f"Expected asyncpg driver, got: {url}"
 
-engine = create_async_engine(
-    settings.DATABASE_URL,  # должен содержать +asyncpg
-    pool_pre_ping=True,
-    future=True,
+
+POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время получения соединения из пула SQLAlchemy (ожидание, pre-ping, новое подключение)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
 )
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Соединения, выданные из пула в данный момент",
+    ["engine"],
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Постоянный размер пула соединений (без overflow)",
+    ["engine"],
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул, который замеряет время выдачи соединения. Оборачивается публичный
+    `Pool.connect()` — через него идёт каждый `engine.connect()`; метка `engine`
+    берётся из `pool_logging_name` ("primary" / "replica").
+    """
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_WAIT_SECONDS.labels(self.logging_name).observe(time.perf_counter() - started_at)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    pool_size: int
+    max_overflow: int
+
+
+def resolve_pool_config() -> PoolConfig:
+    """
+    Делит общий бюджет соединений (DB_MAX_CONNECTIONS_BUDGET) между воркерами gunicorn:
+    две трети доли воркера — постоянный пул, остальное — overflow.
+    Явно заданные DB_POOL_SIZE / DB_MAX_OVERFLOW имеют приоритет.
+    """
+    workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count() * 2 + 1
+    per_worker = max(1, settings.DB_MAX_CONNECTIONS_BUDGET // workers)
+    pool_size = settings.DB_POOL_SIZE
+    if pool_size is None:
+        pool_size = max(1, per_worker * 2 // 3)
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if max_overflow is None:
+        max_overflow = max(0, per_worker - pool_size)
+    return PoolConfig(pool_size=pool_size, max_overflow=max_overflow)
+
+
+def _connect_args() -> dict:
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer (transaction pooling) не сохраняет prepared statements между транзакциями
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+pool_config = resolve_pool_config()
+
+
+def _create_engine(database_url: str, name: str):
+    async_engine = create_async_engine(
+        database_url,  # должен содержать +asyncpg
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=pool_config.pool_size,
+        max_overflow=pool_config.max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args=_connect_args(),
+        future=True,
+    )
+    instrument_engine(async_engine.sync_engine)
+    slow_query_log.install(async_engine)
+    POOL_SIZE.labels(name).set(pool_config.pool_size)
+    POOL_CHECKED_OUT.labels(name).set_function(lambda: async_engine.pool.checkedout())
+    return async_engine
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+# Необязательная read-реплика; без неё чтения идут в primary
+read_engine = _create_engine(settings.READ_DATABASE_URL, "replica") if settings.READ_DATABASE_URL else None
 
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False) if read_engine else None
@@ -0,0 +1,171 @@
+# app/db/slow_query.py
+import asyncio
+import contextvars
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import structlog
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.instrumentation import current_request_stats
+
+logger = structlog.get_logger("app.sql.slow")
+
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL-запросы дольше SLOW_QUERY_THRESHOLD_MS",
+    ["route"],
+)
+SLOW_QUERY_PLANS = Counter(
+    "db_slow_query_plans_total",
+    "Фоновые EXPLAIN медленных запросов по исходу: captured или failed",
+    ["outcome"],
+)
+
+
+def _parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Типы связанных параметров без значений: значения могут содержать персональные данные."""
+    def shape(params: Any) -> Any:
+        if isinstance(params, dict):
+            return {key: type(value).__name__ for key, value in params.items()}
+        if isinstance(params, (list, tuple)):
+            return [type(value).__name__ for value in params]
+        return type(params).__name__
+
+    if executemany and parameters:
+        return {"rows": len(parameters), "row": shape(parameters[0])}
+    return shape(parameters)
+
+
+class ExplainBudget:
+    """
+    Ограничивает число EXPLAIN: случайная выборка, не больше `max_per_minute`
+    на процесс и не чаще одного плана на форму запроса за `dedup_seconds`.
+    """
+
+    def __init__(self, sample_rate: float, max_per_minute: int, dedup_seconds: float):
+        self.sample_rate = sample_rate
+        self.max_per_minute = max_per_minute
+        self.dedup_seconds = dedup_seconds
+        self._recent: List[float] = []
+        self._explained_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, fingerprint: str) -> bool:
+        if self.max_per_minute <= 0 or random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained_at.get(fingerprint)
+            if last is not None and now - last < self.dedup_seconds:
+                return False
+            self._recent = [at for at in self._recent if now - at < 60]
+            if len(self._recent) >= self.max_per_minute:
+                return False
+            self._recent.append(now)
+            self._explained_at[fingerprint] = now
+            if len(self._explained_at) > 10_000:
+                self._explained_at = {
+                    key: at for key, at in self._explained_at.items() if now - at < self.dedup_seconds
+                }
+            return True
+
+
+class SlowQueryLog:
+    """
+    Пишет в лог запросы дольше `SLOW_QUERY_THRESHOLD_MS`: SQL, форму параметров,
+    маршрут и длительность. Для части из них (см. `ExplainBudget`) в фоне снимается
+    план `EXPLAIN` отдельным соединением и пишется событием `slow_query_plan`
+    с тем же `query_id`. Счётчики `db_slow_queries_total` и `db_slow_query_plans_total`
+    показывают то же в Prometheus.
+    """
+
+    def __init__(self, threshold_ms: float, budget: ExplainBudget):
+        self.threshold_seconds = threshold_ms / 1000
+        self.budget = budget
+        self._tasks: Set[asyncio.Task] = set()
+
+    def install(self, async_engine: AsyncEngine) -> None:
+        if self.threshold_seconds <= 0:
+            return
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            seconds = conn.info.get("last_query_seconds")
+            if seconds is None or seconds < self.threshold_seconds:
+                return
+            if statement.lstrip()[:7].upper() == "EXPLAIN":
+                return
+            self._on_slow_query(async_engine, statement, parameters, executemany, seconds)
+
+        # Подключается после app.db.instrumentation, который замеряет время
+        event.listen(async_engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+    def _on_slow_query(
+        self, async_engine: AsyncEngine, statement: str, parameters: Any, executemany: bool, seconds: float
+    ) -> None:
+        fingerprint = hashlib.sha1(statement.encode()).hexdigest()[:16]
+        stats = current_request_stats()
+        route = stats.route if stats is not None else None
+        explain = not executemany and self.budget.acquire(fingerprint)
+        SLOW_QUERIES.labels(route=route or "background").inc()
+        logger.warning(
+            "slow_query",
+            query_id=fingerprint,
+            duration_ms=round(seconds * 1000, 2),
+            route=route,
+            statement=statement,
+            parameters=_parameter_shape(parameters, executemany),
+            explain_scheduled=explain,
+        )
+        if not explain:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Пустой контекст: запросы EXPLAIN не должны попадать в статистику HTTP-запроса
+        task = loop.create_task(
+            self._explain(async_engine, fingerprint, statement, parameters),
+            context=contextvars.Context(),
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, async_engine: AsyncEngine, fingerprint: str, statement: str, parameters: Any) -> None:
+        options = "FORMAT JSON"
+        if settings.SLOW_QUERY_EXPLAIN_ANALYZE and statement.lstrip().upper().startswith("SELECT"):
+            options = "ANALYZE, BUFFERS, FORMAT JSON"
+        try:
+            async with async_engine.connect() as conn:
+                # Отдельная транзакция, которая всегда откатывается
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"
+                )
+                result = await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+                plan = result.scalar_one()
+                await conn.rollback()
+        except Exception as exc:
+            SLOW_QUERY_PLANS.labels(outcome="failed").inc()
+            logger.info("slow_query_plan_failed", query_id=fingerprint, error=str(exc))
+            return
+        SLOW_QUERY_PLANS.labels(outcome="captured").inc()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        logger.warning("slow_query_plan", query_id=fingerprint, plan=plan)
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    budget=ExplainBudget(
+        sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        max_per_minute=settings.SLOW_QUERY_EXPLAIN_MAX_PER_MINUTE,
+        dedup_seconds=settings.SLOW_QUERY_EXPLAIN_DEDUP_SECONDS,
+    ),
+)
@@ -0,0 +1,23 @@
+# app/db/unit_of_work.py
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Флаг в `session.info`: обработчик сам управляет транзакциями (см. `dependencies.manual_commit`)
+MANUAL_COMMIT = "manual_commit"
+# Список в `session.info`: действия после успешной фиксации (см. `on_commit`)
+AFTER_COMMIT = "after_commit"
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Выполняет `callback` после того, как `get_db` зафиксирует запрос (например, сброс кеша:
+    раньше фиксации параллельное чтение успело бы закешировать старые данные).
+    При откате не вызывается.
+    """
+    db.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit(db: AsyncSession) -> None:
+    for callback in db.info.pop(AFTER_COMMIT, []):
+        await callback()
@@ -1,60 +1,157 @@
 from typing import AsyncGenerator, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status, Query
+from fastapi import Depends, HTTPException, Request, status, Query
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.token_versions import token_versions
+from app.core.tokens import TokenError, token_codec
+from app.crud.base import OffsetPage, Page
+from app.db.loaders import Loaders, loaders_for
+from app.db.routing import read_your_writes
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.db.unit_of_work import MANUAL_COMMIT, run_after_commit
+from app.schemas.token import Principal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
+# Для эндпоинтов, где access-токен не обязателен (например, logout по refresh-токену)
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
 
 class Pagination:
-    def __init__(self, offset: int = 0, limit: int = 20):
+    def __init__(self, offset: int = 0, limit: int = 20, approximate_total: bool = False):
         self.offset = offset
         self.limit = limit
+        self.approximate_total = approximate_total
+
+    def meta(self, page: OffsetPage) -> dict:
+        return {
+            "total": page.total,
+            "limit": self.limit,
+            "offset": self.offset,
+            "approximate": page.approximate,
+        }
+
+    def envelope(self, page: OffsetPage) -> dict:
+        """Ответ в формате `schemas.PaginatedResponse` для результата `paginate`."""
+        return {"data": page.items, "meta": self.meta(page)}
 
 def get_pagination(
     offset: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    approximate_total: bool = Query(False, description="Разрешить оценочный total для больших выборок"),
 ) -> Pagination:
-    return Pagination(offset=offset, limit=limit)
+    return Pagination(offset=offset, limit=limit, approximate_total=approximate_total)
+
+class CursorPagination:
+    def __init__(self, cursor: Optional[str] = None, limit: int = 20):
+        self.cursor = cursor
+        self.limit = limit
+
+    def envelope(self, page: Page) -> dict:
+        """Ответ в формате `schemas.CursorPage` для результата `CRUDBase.get_page`."""
+        return {"data": page.items, "meta": {"limit": self.limit, "next_cursor": page.next_cursor}}
+
+def get_cursor_pagination(
+    cursor: Optional[str] = Query(None, description="Курсор из meta.next_cursor предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=100),
+) -> CursorPagination:
+    return CursorPagination(cursor=cursor, limit=limit)
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Единица работы на запрос: CRUD-методы только сбрасывают изменения (`flush`),
+    а фиксация одна — после обработчика, до отправки ответа. Исключение в обработчике
+    (включая HTTPException) откатывает всё, что он успел записать.
+
+    Подключать только как `Depends(get_db, scope="function")`: со scope "request"
+    FastAPI закрывает зависимость уже после отправки ответа, и клиент увидел бы
+    ответ раньше, чем данные зафиксированы.
+    """
     async with SessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        if not session.info.get(MANUAL_COMMIT) and session.in_transaction():
+            await session.commit()
+        await run_after_commit(session)
+
+def manual_commit(db: AsyncSession = Depends(get_db, scope="function")) -> AsyncSession:
+    """
+    Отключает автоматическую фиксацию для долгих обработчиков: они сами вызывают
+    `db.commit()` между этапами, чтобы не держать транзакцию и соединение всё время.
+    Незафиксированное к концу запроса откатывается.
+    Подключается как `dependencies=[Depends(manual_commit)]` или вместо `get_db`.
+    """
+    db.info[MANUAL_COMMIT] = True
+    return db
+
+def get_loaders(db: AsyncSession = Depends(get_db, scope="function")) -> Loaders:
+    """Загрузчики пользователей и команд сессии запроса (см. `app.db.loaders`)."""
+    return loaders_for(db)
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для чтения: read-реплика, если она настроена и пользователь недавно ничего не писал.
+    Заголовок Authorization читается напрямую, чтобы не менять OpenAPI-схему публичных эндпоинтов;
+    `sub` берётся без проверки подписи — он влияет только на выбор сервера, не на доступ.
+    """
+    session_factory = ReadSessionLocal or SessionLocal
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if ReadSessionLocal is not None and scheme.lower() == "bearer" and token:
+        try:
+            user_id = UUID(token_codec.unverified_claims(token)["sub"])
+        except (TokenError, KeyError, TypeError, ValueError):
+            user_id = None
+        if user_id is not None and await read_your_writes.is_pinned(user_id):
+            session_factory = SessionLocal
+    async with session_factory() as session:
         yield session
 
 async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+    request: Request,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    token: str = Depends(reusable_oauth2),
+) -> Principal:
+    """
+    Аутентифицирует запрос без загрузки пользователя: БД нужна только при промахе
+    кеша `token_versions`. Обработчики, которым нужна полная модель, используют
+    `get_current_user_model`.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    token_data = security.verify_token(
-        token=token,
-        secret_key=settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-        credentials_exception=credentials_exception
-    )
+    principal = await security.get_principal(token, credentials_exception)
 
-    if token_data.sub is None:
-        raise credentials_exception
-
-    try:
-        user_id = UUID(token_data.sub)
-    except ValueError:
+    current_version = await token_versions.get(
+        principal.id, lambda: crud.user.get_token_version(db, user_id=principal.id)
+    )
+    if current_version is None or principal.token_version < current_version:
         raise credentials_exception
+    request.state.principal = principal
+    return principal
 
-    user = await crud.user.get(db, id=user_id)
+async def get_current_user_model(
+    loaders: Loaders = Depends(get_loaders),
+    current_user: Principal = Depends(get_current_user),
+) -> models.User:
+    user = await loaders.users.load(current_user.id)
     if not user:
-        raise credentials_exception
-        
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
@@ -3,8 +3,21 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.routers import (users, teams, sports, auth, sponsors, playgrounds, posts, comments, like, invitation, friend_request, lfg, subscriptions)
 from app.core.config import settings
-from fastapi.openapi.utils import get_openapi
-import copy
+from app.core.logging import setup_logging
+from app.core.openapi import build_openapi, openapi_document
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.core.hashing import password_hasher
+from app.core.redis import close_redis
+from app.core.response_cache import response_cache
+from app.core.team_cache import team_cache
+from app.core.revocation import revocation_store
+from app.services.post_counters import post_counter_reconciler
+from app.services.session_reaper import session_reaper
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
+from prometheus_fastapi_instrumentator import Instrumentator
+from contextlib import asynccontextmanager
+import asyncio
 
 class LimitRequestSizeMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, max_size: int):
@@ -18,12 +31,51 @@ class LimitRequestSizeMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Все роутеры уже подключены: схема собирается один раз, до первого запроса
+    openapi_document.load(app)
+    revocation_sync = asyncio.create_task(
+        revocation_store.run_sync_loop(settings.REVOCATION_SYNC_INTERVAL_SECONDS)
+    )
+    reaper = asyncio.create_task(
+        session_reaper.run(
+            interval=settings.SESSION_REAPER_INTERVAL_SECONDS,
+            batch_size=settings.SESSION_REAPER_BATCH_SIZE,
+        )
+    )
+    counters = asyncio.create_task(
+        post_counter_reconciler.run(
+            interval=settings.POST_COUNTER_RECONCILE_INTERVAL_SECONDS,
+            batch_size=settings.POST_COUNTER_RECONCILE_BATCH_SIZE,
+        )
+    )
+    cache_invalidations = asyncio.create_task(response_cache.listen())
+    team_invalidations = asyncio.create_task(team_cache.listen())
+    yield
+    team_invalidations.cancel()
+    cache_invalidations.cancel()
+    counters.cancel()
+    reaper.cancel()
+    revocation_sync.cancel()
+    password_hasher.shutdown()
+    await close_redis()
+
+
+setup_logging()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan, openapi_url=None, docs_url=None, redoc_url=None)
 app.openapi_version = "3.1.0"
 
 # Add the middleware with a 1MB size limit
 app.add_middleware(LimitRequestSizeMiddleware, max_size=1_000_000) 
 
+# Pins a user's reads to the primary for a few seconds after they write
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request SQL stats: Server-Timing header, Prometheus histograms, N+1 warnings
+app.add_middleware(QueryStatsMiddleware)
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,39 +84,40 @@ app.add_middleware(
     allow_methods=["*"]
 )
 
-def _dev_patch_openapi(doc: dict) -> dict:
-     import copy
-     def fix_node(node):
-         if isinstance(node, dict):
-             # anyOf [X, null] -> nullable, формат не трогаем
-             if "anyOf" in node:
-                 types = [x.get("type") for x in node["anyOf"] if isinstance(x, dict)]
-                 if "null" in types:
-                     base = next((x for x in node["anyOf"] if x.get("type") != "null"), None)
-                     if base:
-                         node.pop("anyOf", None)
-                         node.update({k: v for k, v in base.items()})
-                         node["nullable"] = True
-             # ↓ Больше ничего не трогаем: format: uuid остаётся
-             for v in list(node.values()):
-                 fix_node(v)
-         elif isinstance(node, list):
-             for v in node: fix_node(v)
-     new_doc = copy.deepcopy(doc)
-     fix_node(new_doc)
-     return new_doc
+Instrumentator().instrument(app).expose(app, include_in_schema=False)
 
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
-    schema = get_openapi(title=settings.PROJECT_NAME, version="1.0.0",
-                         description="Prodvor API", routes=app.routes)
-    app.openapi_schema = _dev_patch_openapi(schema)
+    app.openapi_schema = build_openapi(app)
     return app.openapi_schema
 
 app.openapi = custom_openapi
 
 
+# Схема отдаётся готовыми байтами (app/core/openapi.py), поэтому встроенные
+# /openapi.json, /docs и /redoc FastAPI отключены и подключены здесь
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json(request: Request):
+    return openapi_document.response(request, app)
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    return get_swagger_ui_html(
+        openapi_url="/openapi.json",
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Prodvor API"}
@@ -0,0 +1,65 @@
+# app/middleware/query_stats.py
+import structlog
+from fastapi import Request
+from prometheus_client import Counter, Histogram
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.db.instrumentation import start_request_stats
+
+logger = structlog.get_logger(__name__)
+
+REQUEST_QUERY_COUNT = Histogram(
+    "db_queries_per_request",
+    "Число SQL-запросов на один HTTP-запрос",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "db_time_per_request_seconds",
+    "Суммарное время SQL-запросов на один HTTP-запрос",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+N_PLUS_ONE_SUSPECTED = Counter(
+    "db_n_plus_one_suspected_total",
+    "HTTP-запросы, в которых один и тот же SQL повторился не меньше SQL_N_PLUS_ONE_THRESHOLD раз",
+    ["route"],
+)
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Собирает SQL-статистику запроса (см. `app.db.instrumentation`): число запросов,
+    суммарное время и самый медленный запрос. Отдаёт её в заголовке `Server-Timing`
+    и гистограммах Prometheus по маршруту, повторяющиеся запросы логирует как вероятный N+1.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = start_request_stats(request.scope)
+        response = await call_next(request)
+
+        route = stats.route
+        REQUEST_QUERY_COUNT.labels(route=route).observe(stats.count)
+        REQUEST_DB_SECONDS.labels(route=route).observe(stats.total_seconds)
+
+        repeated = stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            N_PLUS_ONE_SUSPECTED.labels(route=route).inc()
+            statement, times = repeated[0]
+            logger.warning(
+                "sql_n_plus_one_suspected",
+                route=route,
+                method=request.method,
+                statement=statement[:500],
+                times=times,
+                total_queries=stats.count,
+            )
+
+        if settings.SQL_SERVER_TIMING_ENABLED and stats.count:
+            response.headers.append(
+                "Server-Timing",
+                f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries", '
+                f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}",
+            )
+        return response
@@ -0,0 +1,22 @@
+# app/middleware/read_your_writes.py
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db.routing import read_your_writes
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    После успешного изменяющего запроса аутентифицированного пользователя
+    закрепляет его чтения за primary (см. `app.db.routing`).
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            principal = getattr(request.state, "principal", None)
+            if principal is not None:
+                await read_your_writes.pin(principal.id)
+        return response
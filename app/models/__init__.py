@@ -15,6 +15,7 @@ from .like import Like
 from .playground import Playground
 from .sponsor import Sponsor
 from .friend_request import FriendRequest
+from .friendship import Friendship
 from .subscription import Subscription
 from .notification import Notification, NotificationType
 from .team_application import TeamApplication
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import uuid
 import enum
-from sqlalchemy import Column, ForeignKey, String, DateTime, Enum
+from sqlalchemy import Column, ForeignKey, String, DateTime, Enum, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -19,6 +19,10 @@ class FriendRequestStatus(enum.Enum):
 
 class FriendRequest(Base):
     __tablename__ = 'friend_requests'
+    __table_args__ = (
+        Index("ix_friend_requests_requester_id_status", "requester_id", "status"),
+        Index("ix_friend_requests_receiver_id_status", "receiver_id", "status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     requester_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+import uuid
+from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+from datetime import datetime
+
+class Friendship(Base):
+    """
+    Ребро дружбы; хранится в обе стороны, поэтому «друзья X» — один диапазон
+    первичного ключа (user_id, friend_id). Пишется при принятии заявки.
+    """
+    __tablename__ = 'friendships'
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    friend_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    since: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
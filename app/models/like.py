@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, DateTime
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base_class import Base
@@ -13,8 +13,12 @@ if TYPE_CHECKING:
 
 class Like(Base):
     __tablename__ = 'likes'
+    __table_args__ = (
+        Index("ix_likes_post_id", "post_id"),
+        Index("ix_likes_user_id_post_id", "user_id", "post_id"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'))
     post_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('posts.id'))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
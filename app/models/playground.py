@@ -1,16 +1,17 @@
 import uuid
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base_class import Base
 from datetime import datetime
 
 class Playground(Base):
     __tablename__ = 'playgrounds'
+    __table_args__ = (Index("ix_playgrounds_created_at_id", "created_at", "id"),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(150))
     location = Column(String(250))
     sports = Column(String(250))
     type = Column(String(100))
     surface = Column(String(100))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, List
 import uuid
-from sqlalchemy import Column, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -16,12 +16,17 @@ if TYPE_CHECKING:
 
 class Post(Base):
     __tablename__ = 'posts'
+    __table_args__ = (Index("ix_posts_created_at_id", "created_at", "id"),)
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     author_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     team_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('teams.id'), nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Денормализованные счётчики: меняются в одной транзакции с лайком/комментарием,
+    # расхождения чинит app.services.post_counters
+    like_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     comments: Mapped[List["Comment"]] = relationship('Comment', back_populates='post', cascade="all, delete-orphan")
     likes: Mapped[List["Like"]] = relationship('Like', back_populates='post', cascade="all, delete-orphan")
@@ -1,6 +1,6 @@
 # app/models/session.py
 import uuid
-from sqlalchemy import Column, ForeignKey, String, DateTime
+from sqlalchemy import Column, ForeignKey, String, DateTime, LargeBinary, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -11,12 +11,22 @@ class Session(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    refresh_token = Column(String, nullable=False, unique=True, index=True)
+    # sha256 от refresh-токена: фиксированные 32 байта в уникальном индексе вместо всей строки JWT
+    refresh_token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)
+    # Хеш токена, заменённого последней ротацией, — для обнаружения повторного использования
+    previous_token_hash = Column(LargeBinary(32), nullable=True, index=True)
+    # Момент последней ротации: повтор старого токена сразу после неё — гонка/ретрай клиента, а не кража
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
     user_agent = Column(String, nullable=False)
     ip_address = Column(String, nullable=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
     user = relationship("User", back_populates="sessions")
+
+    __table_args__ = (
+        # Лимит сессий вытесняет давно не ротированные (crud.session.create_with_cap)
+        Index("ix_sessions_user_id_updated_at", "user_id", "updated_at"),
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
-from sqlalchemy import Column, String, Boolean, Integer, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.base_class import Base
 from datetime import datetime
@@ -11,8 +11,9 @@ if TYPE_CHECKING:
 
 class Sport(Base):
     __tablename__ = "sports"
+    __table_args__ = (Index("ix_sports_created_at_id", "created_at", "id"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     isTeamSport: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
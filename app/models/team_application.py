@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.base_class import Base
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 class TeamApplication(Base):
     __tablename__ = 'team_applications'
+    __table_args__ = (Index("ix_team_applications_team_id", "team_id"),)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
     team_id: Mapped[UUID] = mapped_column(ForeignKey("teams.id"), primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -1,7 +1,7 @@
 # app/models/user.py
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
-from sqlalchemy import Column, String, DateTime, Date, ForeignKey
+from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Integer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -43,6 +43,8 @@ class User(Base):
     avatar_url: Mapped[str] = mapped_column(String, nullable=True)
     s3_path: Mapped[str] = mapped_column(String, nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    # Повышается, чтобы разом отозвать все выданные access-токены пользователя
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.dependencies import get_db, get_current_user, optional_oauth2, reusable_oauth2
+from app.schemas.token import Principal
 from app.schemas.token import Token, RefreshTokenRequest
 from app.schemas.user import UserCreate, User
 from app.services.auth_service import auth_service
@@ -13,7 +14,7 @@ router = APIRouter()
 @router.post("/register", response_model=User)
 async def register(
     *, 
-    db: AsyncSession = Depends(get_db), 
+    db: AsyncSession = Depends(get_db, scope="function"), 
     user_in: UserCreate
 ) -> User:
     user = await auth_service.register_user(db, user_in=user_in)
@@ -22,7 +23,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
     user = await auth_service.authenticate_user(
@@ -35,7 +36,7 @@ async def login(
     ip_address = request.client.host
 
     access_token, refresh_token = await auth_service.create_session(
-        db, user_id=user.id, user_agent=user_agent, ip_address=ip_address
+        db, user_id=user.id, token_version=user.token_version, user_agent=user_agent, ip_address=ip_address
     )
 
     return {"access_token": access_token, "refresh_token": refresh_token}
@@ -44,7 +45,7 @@ async def login(
 async def refresh(
     token_request: RefreshTokenRequest,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> Token:
     user_agent = request.headers.get("user-agent", "unknown")
     ip_address = request.client.host
@@ -58,7 +59,24 @@ async def refresh(
 @router.post("/logout")
 async def logout(
     token_request: RefreshTokenRequest,
-    db: AsyncSession = Depends(get_db), 
+    db: AsyncSession = Depends(get_db, scope="function"), 
+    access_token: str | None = Depends(optional_oauth2),
 ) -> Response:
-    await auth_service.logout(db, refresh_token=token_request.refresh_token)
+    """
+    Завершает сессию refresh-токена. Если передан access-токен, он отзывается сразу.
+    """
+    await auth_service.logout(db, refresh_token=token_request.refresh_token, access_token=access_token)
     return Response(status_code=200, content="Successfully logged out")
+
+
+@router.post("/logout-all")
+async def logout_all(
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: Principal = Depends(get_current_user),
+    access_token: str = Depends(reusable_oauth2),
+) -> Response:
+    """
+    Завершает все сессии пользователя на всех устройствах.
+    """
+    await auth_service.logout_all(db, user_id=current_user.id, access_token=access_token)
+    return Response(status_code=200, content="Successfully logged out from all devices")
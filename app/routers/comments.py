@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.dependencies import get_db, get_current_user
+from app.core.conditional import Validators
+from app.dependencies import get_db, get_read_db, get_current_user, get_cursor_pagination, CursorPagination
 from typing import List
 from uuid import UUID
 
@@ -10,9 +11,9 @@ router = APIRouter()
 @router.post("", response_model=schemas.Comment)
 async def create_comment(
     *, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     comment_in: schemas.CommentCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     # Проверка существования поста
     post = await crud.post.get(db, id=comment_in.postId)
@@ -23,33 +24,42 @@ async def create_comment(
 @router.get("/{comment_id}", response_model=schemas.Comment)
 async def read_comment(
     comment_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
+    version = await crud.comment.get_version(db, id=comment_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    validators = Validators("comment", comment_id, version)
+    if validators.is_fresh(request):
+        return validators.not_modified()
     comment = await crud.comment.get(db=db, id=comment_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
+    validators.apply(response)
     return comment
 
-@router.get("/post/{post_id}", response_model=List[schemas.Comment])
+@router.get("/post/{post_id}", response_model=schemas.CursorPage[schemas.Comment])
 async def read_comments_for_post(
     post_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
 ):
     # Проверка существования поста
     post = await crud.post.get(db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return await crud.comment.get_multi_by_post(db, post_id=post_id, skip=skip, limit=limit)
+    page = await crud.comment.get_page_by_post(db, post_id=post_id, cursor=pagination.cursor, limit=pagination.limit)
+    return pagination.envelope(page)
 
 @router.put("/{comment_id}", response_model=schemas.Comment)
 async def update_comment(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     comment_id: UUID,
     comment_in: schemas.CommentUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     comment = await crud.comment.get(db=db, id=comment_id)
     if not comment:
@@ -61,13 +71,15 @@ async def update_comment(
 @router.delete("/{comment_id}", response_model=schemas.Comment)
 async def delete_comment(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     comment_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     comment = await crud.comment.get(db=db, id=comment_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     if comment.authorId != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return await crud.comment.remove(db=db, id=comment_id)
+    if await crud.comment.remove(db=db, id=comment_id) is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return comment
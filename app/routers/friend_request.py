@@ -3,6 +3,7 @@ import math
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
+from app.crud.base import paginate
 from app.dependencies import get_db, get_current_user, get_pagination, Pagination
 from app.schemas.pagination import PaginatedResponse
 import uuid
@@ -10,22 +11,13 @@ from app.models.friend_request import FriendRequestStatus
 
 router = APIRouter()
 
-def serialize_user(user: models.User) -> dict:
-    return {
-        "id": str(user.id),
-        "email": user.email,
-        "nickname": user.nickname,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "birth_date": str(user.birth_date),
-    }
 
 @router.post("", response_model=schemas.FriendRequest)
 async def create_friend_request(
     *, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     friend_request_in: schemas.FriendRequestCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     # Prevent users from sending a friend request to themselves
     if current_user.id == friend_request_in.receiver_id:
@@ -40,41 +32,41 @@ async def create_friend_request(
 
 @router.get("/received", response_model=list[schemas.FriendRequest])
 async def get_received_friend_requests(
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     return await crud.friend_request.get_received(db=db, user_id=current_user.id)
 
-@router.get("/friends")
+@router.get("/friends", response_model=PaginatedResponse[schemas.User])
 async def get_friends(
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
     pagination: Pagination = Depends(get_pagination),
 ):
-    # Все id друзей текущего пользователя
-    friend_ids = await crud.friend_request.get_friend_ids(db, user_id=current_user.id)
+    page = await paginate(
+        db,
+        crud.friendship.friends_query(user_id=current_user.id),
+        offset=pagination.offset,
+        limit=pagination.limit,
+        approximate=pagination.approximate_total,
+    )
+    return pagination.envelope(page)
 
-    total = len(friend_ids)
-    start = pagination.offset
-    end = start + pagination.limit
-    page_ids = friend_ids[start:end]
-
-    friends = await crud.user.get_many_by_ids(db, ids=page_ids)
-
-    return {
-        "meta": {
-            "total": total,
-            "limit": pagination.limit,
-            "offset": pagination.offset,
-        },
-        "data": [serialize_user(u) for u in friends],
-    }
+@router.delete("/friends/{friend_id}", response_model=schemas.Msg)
+async def unfriend(
+    friend_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
+):
+    if not await crud.friend_request.unfriend(db, user_id=current_user.id, friend_id=friend_id):
+        raise HTTPException(status_code=404, detail="Friend not found")
+    return {"msg": "Friend removed"}
 
 @router.put("/{request_id}/accept", response_model=schemas.FriendRequest)
 async def accept_friend_request(
     request_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     friend_request = await crud.friend_request.get(db, id=request_id)
     if not friend_request or friend_request.receiver_id != current_user.id:
@@ -83,16 +75,13 @@ async def accept_friend_request(
     if friend_request.status != FriendRequestStatus.pending:
         raise HTTPException(status_code=400, detail="Friend request is not pending.")
 
-    friend_request.status = FriendRequestStatus.accepted
-    await db.flush()
-    await db.commit()
-    return friend_request
+    return await crud.friend_request.accept(db, db_obj=friend_request)
 
 @router.put("/{request_id}/decline", response_model=schemas.FriendRequest)
 async def decline_friend_request(
     request_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     friend_request = await crud.friend_request.get(db, id=request_id)
     if not friend_request or friend_request.receiver_id != current_user.id:
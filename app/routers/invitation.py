@@ -10,20 +10,20 @@ router = APIRouter()
 
 @router.post("", response_model=InvitationSchema)
 async def create_invitation(invitation_in: InvitationCreate,
-                            db: AsyncSession = Depends(get_db),
+                            db: AsyncSession = Depends(get_db, scope="function"),
                             user=Depends(get_current_user)):
     inv = await crud.invitation.create_invitation(db=db, obj_in=invitation_in)
     return inv
 
 @router.get("/user/{user_id}", response_model=list[InvitationSchema])
 async def get_user_invitations(user_id: UUID,
-                               db: AsyncSession = Depends(get_db),
+                               db: AsyncSession = Depends(get_db, scope="function"),
                                user=Depends(get_current_user)):
     return await crud.invitation.get_user_invitations(db=db, user_id=user_id)
 
 @router.put("/{invitation_id}/accept", response_model=InvitationSchema)
 async def accept_invitation(invitation_id: UUID,
-                            db: AsyncSession = Depends(get_db),
+                            db: AsyncSession = Depends(get_db, scope="function"),
                             user=Depends(get_current_user)):
     inv = await crud.invitation.accept(db, invitation_id)
     if not inv:
@@ -32,7 +32,7 @@ async def accept_invitation(invitation_id: UUID,
 
 @router.put("/{invitation_id}/decline", response_model=InvitationSchema)
 async def decline_invitation(invitation_id: UUID,
-                             db: AsyncSession = Depends(get_db),
+                             db: AsyncSession = Depends(get_db, scope="function"),
                              user=Depends(get_current_user)):
     inv = await crud.invitation.decline(db, invitation_id)
     if not inv:
@@ -4,31 +4,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import crud, schemas, models
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_db, get_read_db, get_current_user, get_cursor_pagination, CursorPagination
 
 router = APIRouter()
 
-@router.get("", response_model=List[schemas.lfg.LFG])
+@router.get("", response_model=schemas.CursorPage[schemas.lfg.LFG])
 async def read_lfgs(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
     type: str = None,
     sport_id: int = None,
     role: str = None,
 ):
     """
-    Retrieve LFG posts.
+    Retrieve LFG posts, newest first.
     """
-    lfgs = await crud.lfg.get_multi(db, skip=skip, limit=limit, type=type, sport_id=sport_id, role=role)
-    return lfgs
+    page = await crud.lfg.get_page(
+        db, cursor=pagination.cursor, limit=pagination.limit, type=type, sport_id=sport_id, role=role
+    )
+    return pagination.envelope(page)
 
 @router.post("", response_model=schemas.lfg.LFG, dependencies=[Depends(get_current_user)])
 async def create_lfg(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     lfg_in: schemas.lfg.LFGCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     """
     Create new LFG post.
@@ -39,13 +40,13 @@ async def create_lfg(
                 status_code=400,
                 detail="team_id is required for type 'team'",
             )
-        team = await crud.team.get(db, id=lfg_in.team_id)
-        if not team:
+        access = await crud.team.get_access(db, lfg_in.team_id)
+        if access is None:
             raise HTTPException(
                 status_code=404,
                 detail="Team not found",
             )
-        if team.captain_id != current_user.id:
+        if access.owner_id != current_user.id:
             raise HTTPException(
                 status_code=403,
                 detail="Only the team captain can create a 'team' LFG post",
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_db, get_read_db, get_current_user
 import uuid
 
 router = APIRouter()
@@ -9,9 +9,9 @@ router = APIRouter()
 @router.post("", response_model=schemas.Like)
 async def create_like(
     *, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     like_in: schemas.LikeCreateRequest,  # Use the new request schema
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     # Check if the user has already liked the post
     existing_like = await crud.like.get_by_user_and_post(db, user_id=current_user.id, post_id=like_in.post_id)
@@ -26,22 +26,21 @@ async def create_like(
 @router.delete("/{post_id}", response_model=schemas.Like)
 async def delete_like(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     post_id: uuid.UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     like = await crud.like.get_by_user_and_post(db, user_id=current_user.id, post_id=post_id)
     if not like:
         raise HTTPException(status_code=404, detail="Like not found")
-    
-    # The CRUDBase expects the model instance to remove, not just the ID.
-    # So we pass the `like` object we just fetched.
-    return await crud.like.remove(db=db, id=like.id)
+    if await crud.like.remove(db=db, id=like.id) is None:
+        raise HTTPException(status_code=404, detail="Like not found")
+    return like
 
 @router.get("/post/{post_id}/count", response_model=schemas.LikeCount)
 async def get_like_count_for_post(
     post_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     count = await crud.like.get_like_count_for_post(db, post_id=post_id)
     return {"count": count}
@@ -49,6 +48,6 @@ async def get_like_count_for_post(
 @router.get("/user/{user_id}/liked-posts", response_model=list[schemas.Post])
 async def get_liked_posts_by_user(
     user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     return await crud.like.get_liked_posts_by_user(db, user_id=user_id)
@@ -1,34 +1,41 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import crud, schemas, models
-from app.dependencies import get_db, get_current_user
+from app.core.response_cache import response_cache, serialize
+from app.dependencies import get_db, get_current_user, get_cursor_pagination, CursorPagination
+from app.db.unit_of_work import on_commit
 
 router = APIRouter()
 
-@router.get("", response_model=List[schemas.playground.Playground])
+@router.get("", response_model=schemas.CursorPage[schemas.playground.Playground])
 async def read_playgrounds(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    # Промах кеша читает с primary: с реплики в общий кеш мог бы попасть ответ без только что созданной записи
+    db: AsyncSession = Depends(get_db, scope="function"),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
 ):
     """
-    Retrieve playgrounds.
+    Retrieve playgrounds, newest first.
     """
-    playgrounds = await crud.playground.get_multi(db, skip=skip, limit=limit)
-    return playgrounds
+    async def load() -> bytes:
+        page = await crud.playground.get_page(db, cursor=pagination.cursor, limit=pagination.limit)
+        return serialize(schemas.CursorPage[schemas.playground.Playground], pagination.envelope(page))
+
+    return await response_cache.respond("playgrounds", request, load)
 
 @router.post("", response_model=schemas.playground.Playground)
 async def create_playground(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     playground_in: schemas.playground.PlaygroundCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     """
     Create new playground.
     """
     playground = await crud.playground.create(db, obj_in=playground_in)
+    on_commit(db, lambda: response_cache.invalidate("playgrounds"))
     return playground
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.dependencies import get_db, get_current_user
+from app.core.conditional import Validators
+from app.dependencies import get_db, get_read_db, get_current_user, get_cursor_pagination, CursorPagination
 from typing import List
 from uuid import UUID
 
@@ -10,37 +11,46 @@ router = APIRouter()
 @router.post("", response_model=schemas.Post)
 async def create_post(
     *, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     post_in: schemas.PostCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     return await crud.post.create_with_author(db=db, obj_in=post_in, author_id=current_user.id)
 
 @router.get("/{post_id}", response_model=schemas.Post)
 async def read_post(
     post_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
+    version = await crud.post.get_version(db, id=post_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    validators = Validators("post", post_id, version)
+    if validators.is_fresh(request):
+        return validators.not_modified()
     post = await crud.post.get(db=db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    validators.apply(response)
     return post
 
-@router.get("", response_model=List[schemas.Post])
+@router.get("", response_model=schemas.CursorPage[schemas.Post])
 async def read_posts(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
 ):
-    return await crud.post.get_multi(db, skip=skip, limit=limit)
+    page = await crud.post.get_page(db, cursor=pagination.cursor, limit=pagination.limit)
+    return pagination.envelope(page)
 
 @router.put("/{post_id}", response_model=schemas.Post)
 async def update_post(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     post_id: UUID,
     post_in: schemas.PostUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     post = await crud.post.get(db=db, id=post_id)
     if not post:
@@ -52,9 +62,9 @@ async def update_post(
 @router.delete("/{post_id}", response_model=schemas.Post)
 async def delete_post(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     post_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.Principal = Depends(get_current_user)
 ):
     post = await crud.post.get(db=db, id=post_id)
     if not post:
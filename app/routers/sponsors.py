@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app import crud, schemas, models
-from app.dependencies import get_db, get_current_user
+from app.core.response_cache import response_cache, serialize
+from app.dependencies import get_db, get_read_db, get_current_user
 
 router = APIRouter()
 
 @router.get("", response_model=List[schemas.sponsor.Sponsor])
 async def read_sponsors(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
 ):
     """
     Retrieve sponsors.
     """
-    sponsors = await crud.sponsor.get_multi(db, skip=skip, limit=limit)
-    return sponsors
+    # Спонсоры меняются только скриптами, поэтому кеш обновляется по TTL
+    async def load() -> bytes:
+        sponsors = await crud.sponsor.get_multi(db, skip=skip, limit=limit)
+        return serialize(List[schemas.sponsor.Sponsor], sponsors)
+
+    return await response_cache.respond("sponsors", request, load)
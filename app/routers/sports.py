@@ -1,31 +1,37 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import crud, schemas, models
-from app.dependencies import get_db, get_current_user
+from app.core.response_cache import response_cache, serialize
+from app.dependencies import get_db, get_current_user, get_cursor_pagination, CursorPagination
+from app.db.unit_of_work import on_commit
 
 router = APIRouter()
 
-@router.get("", response_model=List[schemas.sport.Sport])
+@router.get("", response_model=schemas.CursorPage[schemas.sport.Sport])
 async def read_sports(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    # Промах кеша читает с primary: с реплики в общий кеш мог бы попасть ответ без только что созданной записи
+    db: AsyncSession = Depends(get_db, scope="function"),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
 ):
     """
-    Retrieve sports.
+    Retrieve sports, newest first.
     """
-    sports = await crud.sport.get_multi(db, skip=skip, limit=limit)
-    return sports
+    async def load() -> bytes:
+        page = await crud.sport.get_page(db, cursor=pagination.cursor, limit=pagination.limit)
+        return serialize(schemas.CursorPage[schemas.sport.Sport], pagination.envelope(page))
+
+    return await response_cache.respond("sports", request, load)
 
 @router.post("", response_model=schemas.sport.Sport)
 async def create_sport(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     sport_in: schemas.sport.SportCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     """
     Create new sport.
@@ -37,4 +43,5 @@ async def create_sport(
             detail="Sport with this name already exists in the system.",
         )
     sport = await crud.sport.create(db, obj_in=sport_in)
+    on_commit(db, lambda: response_cache.invalidate("sports"))
     return sport
@@ -14,7 +14,7 @@ class SubscribeRequest(BaseModel):
 
 @router.post("/subscribe", status_code=204)
 async def subscribe(req: SubscribeRequest,
-                    db: AsyncSession = Depends(get_db),
+                    db: AsyncSession = Depends(get_db, scope="function"),
                     current_user = Depends(get_current_user)):
     await crud.subscription.subscribe(
         db=db, user_id=current_user.id, team_id=req.team_id
@@ -23,7 +23,7 @@ async def subscribe(req: SubscribeRequest,
 
 @router.post("/unsubscribe", status_code=204)
 async def unsubscribe(req: SubscribeRequest,
-                      db: AsyncSession = Depends(get_db),
+                      db: AsyncSession = Depends(get_db, scope="function"),
                       current_user = Depends(get_current_user)):
     await crud.subscription.unsubscribe(
         db=db, user_id=current_user.id, team_id=req.team_id
@@ -32,13 +32,13 @@ async def unsubscribe(req: SubscribeRequest,
 
 @router.get("/status")
 async def status(team_id: UUID4 = Query(...),
-                 db: AsyncSession = Depends(get_db),
+                 db: AsyncSession = Depends(get_db, scope="function"),
                  current_user = Depends(get_current_user)):
     is_following = await crud.subscription.is_subscribed(db=db, user_id=current_user.id, team_id=team_id)
     return {"is_following": is_following}
 
 @router.get("/notifications")
-async def get_notification_history(db: AsyncSession = Depends(get_db),
+async def get_notification_history(db: AsyncSession = Depends(get_db, scope="function"),
                                    current_user = Depends(get_current_user)):
     # имя функции должно существовать в crud_notification
     return await crud.notification.get_notifications_for_user(
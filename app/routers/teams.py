@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
 from app import crud, models, schemas
-from app.dependencies import get_db, get_current_user
+from app.core.conditional import Validators
+from app.core.response_cache import serialize
+from app.core.team_cache import team_cache
+from app.db.loaders import Loaders
+from app.dependencies import get_db, get_read_db, get_loaders, get_current_user, get_cursor_pagination, CursorPagination
 
 
 router = APIRouter()
@@ -13,24 +17,23 @@ router = APIRouter()
 class LogoUpdate(BaseModel):
     logoUrl: str | None = Field(None, alias="logoUrl")
 
-@router.get("", response_model=List[schemas.team.Team])
+@router.get("", response_model=schemas.CursorPage[schemas.team.Team])
 async def read_teams(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+    pagination: CursorPagination = Depends(get_cursor_pagination),
 ):
     """
-    Retrieve teams.
+    Retrieve teams, newest first.
     """
-    teams = await crud.team.get_multi(db, skip=skip, limit=limit)
-    return teams
+    page = await crud.team.get_page(db, cursor=pagination.cursor, limit=pagination.limit)
+    return pagination.envelope(page)
 
 @router.post("", response_model=schemas.team.Team, dependencies=[Depends(get_current_user)])
 async def create_team(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     team_in: schemas.team.TeamCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     """
     Create new team.
@@ -41,22 +44,36 @@ async def create_team(
 @router.get("/{team_id}", response_model=schemas.team.Team)
 async def read_team(
     *,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    loaders: Loaders = Depends(get_loaders),
     team_id: UUID,
 ):
     """
-    Get team by ID.
+    Get team by ID. Supports If-None-Match / If-Modified-Since.
+    The serialized team is cached per version (ETag).
     """
-    team = await crud.team.get(db, id=team_id)
-    if not team:
+    version = await crud.team.get_version(db, id=team_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Team not found")
-    return team
+    validators = Validators("team", team_id, version)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    async def load() -> bytes:
+        team = await loaders.teams.load(team_id)
+        if not team:
+            raise HTTPException(status_code=404, detail="Team not found")
+        return serialize(schemas.team.Team, team)
+
+    body = await team_cache.get_body(team_id, validators.etag, load)
+    return Response(content=body, media_type="application/json", headers=validators.headers)
 
 @router.get("/{team_id}/applications", response_model=List[schemas.user.User])
 async def list_applications(
     team_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     applications = await crud.team.list_applications(db, team_id=team_id, owner_id=current_user.id)
     return [app.user for app in applications]
@@ -66,8 +83,8 @@ async def respond_to_application(
     team_id: UUID,
     user_id: UUID,
     action: str = Query(..., pattern="^(accept|decline)$"),
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     if action == "accept":
         await crud.team.accept(db, team_id=team_id, owner_id=current_user.id, user_id=user_id)
@@ -79,8 +96,8 @@ async def respond_to_application(
 @router.post("/{team_id}/apply")
 async def apply_to_team(
     team_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     await crud.team.apply(db, team_id=team_id, user_id=current_user.id)
     return {"message": "Application sent successfully"}
@@ -88,11 +105,10 @@ async def apply_to_team(
 @router.post("/{team_id}/follow")
 async def toggle_team_follow(
     team_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
-    team = await crud.team.get(db, id=team_id)
-    if not team:
+    if await crud.team.get_access(db, team_id) is None:
         raise HTTPException(status_code=404, detail="Team not found")
 
     is_following = await crud.subscription.toggle(
@@ -107,8 +123,8 @@ async def toggle_team_follow(
 async def update_team_logo(
     team_id: UUID,
     logo_update: LogoUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     team = await crud.team.update_logo(
         db,
@@ -124,8 +140,8 @@ async def update_team_logo(
 async def remove_team_member(
     team_id: UUID,
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: schemas.Principal = Depends(get_current_user),
 ):
     """
     Remove a member from a team. Only the owner can do this.
@@ -1,80 +1,85 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas
-from app.dependencies import get_db, get_current_user, get_pagination, Pagination
+from app.core.conditional import Validators
+from app.crud.base import paginate
+from app.db.loaders import Loaders, loaders_for
+from app.dependencies import get_db, get_read_db, get_loaders, get_current_user_model, get_pagination, Pagination
 from app.models import User
 
-def serialize_user(user: User) -> schemas.User:
-    return schemas.User.from_orm(user)
-
 router = APIRouter()
 
 @router.get("/me", response_model=schemas.UserProfile)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user_model)):
     return current_user
 
 @router.get("/{user_id}", response_model=schemas.UserProfile)
-async def read_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    user = await crud.user.get(db, id=user_id)
+async def read_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    loaders: Loaders = Depends(get_loaders),
+):
+    version = await crud.user.get_version(db, id=user_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    validators = Validators("user", user_id, version)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    user = await loaders.users.load(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    validators.apply(response)
     return user
 
-@router.get("/{user_id}/friends")
+@router.get("/{user_id}/friends", response_model=schemas.PaginatedResponse[schemas.User])
 async def list_user_friends(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     pagination: Pagination = Depends(get_pagination),
 ):
-    user = await crud.user.get(db, id=user_id)
+    user = await loaders_for(db).users.load(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    friend_ids = await crud.friend_request.get_friend_ids(db, user_id=user_id)
-    total = len(friend_ids)
-
-    paginated_ids = friend_ids[pagination.offset : pagination.offset + pagination.limit]
-
-    if paginated_ids:
-        friends = await crud.user.get_many_by_ids(db, ids=paginated_ids)
-    else:
-        friends = []
-
-    id_map = {user.id: user for user in friends}
-    ordered_friends = [id_map[id] for id in paginated_ids if id in id_map]
-
-    return {
-        "meta": {
-            "total": total,
-            "limit": pagination.limit,
-            "offset": pagination.offset,
-        },
-        "data": [serialize_user(u) for u in ordered_friends],
-    }
+    page = await paginate(
+        db,
+        crud.friendship.friends_query(user_id=user_id),
+        offset=pagination.offset,
+        limit=pagination.limit,
+        approximate=pagination.approximate_total,
+    )
+    return pagination.envelope(page)
 
-@router.get("/{user_id}/followers")
+@router.get("/{user_id}/followers", response_model=schemas.PaginatedResponse[schemas.User])
 async def read_user_followers(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     pagination: Pagination = Depends(get_pagination),
 ):
-    followers, total = await crud.friend_request.get_followers_with_total(
-        db, user_id=user_id, skip=pagination.offset, limit=pagination.limit
+    page = await crud.friend_request.get_followers_page(
+        db,
+        user_id=user_id,
+        offset=pagination.offset,
+        limit=pagination.limit,
+        approximate=pagination.approximate_total,
     )
-    return {
-        "meta": {"total": total, "limit": pagination.limit, "offset": pagination.offset},
-        "data": [serialize_user(u) for u in followers],
-    }
+    return pagination.envelope(page)
 
 @router.get("/{user_id}/following")
 async def read_user_following(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     pagination: Pagination = Depends(get_pagination),
 ):
-    following_teams, total_teams = await crud.user.get_following_with_total(
-        db, user_id=user_id, skip=pagination.offset, limit=pagination.limit
+    following = await crud.user.get_following_page(
+        db,
+        user_id=user_id,
+        offset=pagination.offset,
+        limit=pagination.limit,
+        approximate=pagination.approximate_total,
     )
 
     return {
@@ -82,8 +87,5 @@ async def read_user_following(
             "meta": {"total": 0, "limit": pagination.limit, "offset": pagination.offset},
             "data": [],
         },
-        "teams": {
-            "meta": {"total": total_teams, "limit": pagination.limit, "offset": pagination.offset},
-            "data": following_teams,
-        }
+        "teams": pagination.envelope(following),
     }
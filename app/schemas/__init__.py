@@ -16,4 +16,5 @@ from .comment import Comment, CommentCreate, CommentUpdate
 from .like import Like, LikeCreate, LikeUpdate, LikeCreateRequest, LikeCount
 from .invitation import Invitation, InvitationCreate, InvitationUpdate
 from .friend_request import FriendRequest, FriendRequestCreate, FriendRequestUpdate
-from .token import Token, RefreshTokenRequest, Msg
+from .token import Token, RefreshTokenRequest, Msg, Principal
+from .pagination import CursorPage, CursorPaginationMeta, PaginatedResponse, PaginationMeta
@@ -1,19 +1,27 @@
 from pydantic import BaseModel, Field
-from typing import List, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic
 
 # Это позволяет нам использовать дженерики в Pydantic
 T = TypeVar('T')
 
 class PaginationMeta(BaseModel):
-    page: int = Field(..., description="Текущая страница")
-    per_page: int = Field(..., description="Элементов на странице")
     total: int = Field(..., description="Всего элементов")
-    pages: int = Field(..., description="Всего страниц")
+    limit: int = Field(..., description="Элементов на странице")
+    offset: int = Field(..., description="Смещение от начала выборки")
+    approximate: bool = Field(False, description="total — оценка планировщика, а не точный подсчёт")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     data: List[T] = Field(..., description="Список элементов")
     meta: PaginationMeta = Field(..., description="Мета-информация о пагинации")
 
+class CursorPaginationMeta(BaseModel):
+    limit: int = Field(..., description="Элементов на странице")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы; null — страница последняя")
+
+class CursorPage(BaseModel, Generic[T]):
+    data: List[T] = Field(..., description="Список элементов")
+    meta: CursorPaginationMeta = Field(..., description="Мета-информация о пагинации")
+
 class Pagination(BaseModel):
     offset: int = 0
     limit: int = 100
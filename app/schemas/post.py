@@ -21,6 +21,8 @@ class PostInDBBase(PostBase):
     author_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    like_count: int = 0
+    comment_count: int = 0
     model_config = ConfigDict(
         from_attributes=True,
         json_encoders={
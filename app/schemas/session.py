@@ -6,7 +6,7 @@ from datetime import datetime
 # Base model for session data
 class SessionBase(BaseModel):
     user_id: uuid.UUID
-    refresh_token: str
+    refresh_token_hash: bytes
     user_agent: str
     ip_address: str
     expires_at: datetime
@@ -17,7 +17,7 @@ class SessionCreate(SessionBase):
 
 # Schema for updating an existing session
 class SessionUpdate(BaseModel):
-    refresh_token: str | None = None
+    refresh_token_hash: bytes | None = None
     expires_at: datetime | None = None
 
 # Schema for reading session data from the database
@@ -1,5 +1,5 @@
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 import uuid
 
@@ -21,3 +21,17 @@ class RefreshTokenRequest(BaseModel):
 class TokenPayload(BaseModel):
     sub: Optional[uuid.UUID] = None
     jti: Optional[str] = None
+    exp: Optional[int] = None
+    ver: int = 0
+
+
+class Principal(BaseModel):
+    """
+    Лёгкое представление аутентифицированного пользователя.
+    Собирается из проверенного токена без обращения к БД.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    id: uuid.UUID
+    jti: Optional[str] = None
+    token_version: int = 0
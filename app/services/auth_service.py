@@ -1,30 +1,27 @@
 # app/services/auth_service.py
-from datetime import datetime, timedelta, timezone
 import uuid
 from fastapi import HTTPException
-from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
 
 from app import crud, models
+from app.core import hashing, security
 from app.core.config import settings
+from app.core.token_versions import token_versions
+from app.core.tokens import TokenError, token_codec
+from app.db.session import SessionLocal
+from app.db.unit_of_work import on_commit
 from app.schemas.session import SessionCreate
 from app.schemas.user import UserCreate, UserCreateDB
 
-crypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = structlog.get_logger(__name__)
 
 class AuthService:
-    def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
-        to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + (expires_delta if expires_delta else timedelta(minutes=15))
-        to_encode.update({"exp": expire, "jti": str(uuid.uuid4())})
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await hashing.verify_password(plain_password, hashed_password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return crypt_context.verify(plain_password, hashed_password)
-
-    def get_password_hash(self, password: str) -> str:
-        return crypt_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await hashing.hash_password(password)
 
     async def register_user(self, db: AsyncSession, *, user_in: UserCreate) -> models.User:
         user = await crud.user.get_by_email(db, email=user_in.email)
@@ -33,7 +30,7 @@ class AuthService:
 
         user_create_db = UserCreateDB(
             email=user_in.email,
-            password=self.get_password_hash(user_in.password),
+            password=await self.get_password_hash(user_in.password),
             nickname=user_in.nickname,
             first_name=user_in.first_name,
             last_name=user_in.last_name,
@@ -44,62 +41,82 @@ class AuthService:
 
     async def authenticate_user(self, db: AsyncSession, *, email: str, password: str) -> models.User | None:
         user = await crud.user.get_by_email(db, email=email)
-        if not user or not self.verify_password(password, user.hashed_password):
+        if not user or not await self.verify_password(password, user.hashed_password):
             return None
         return user
 
-    async def create_session(self, db: AsyncSession, *, user_id: str, user_agent: str, ip_address: str) -> tuple[str, str]:
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = self.create_access_token(data={"sub": str(user_id)}, expires_delta=access_token_expires)
-
-        refresh_token_expires_days = settings.REFRESH_TOKEN_EXPIRE_MINUTES
-        refresh_token = self.create_refresh_token(data={"sub": str(user_id)}, expires_in_days=refresh_token_expires_days)
+    async def create_session(
+        self, db: AsyncSession, *, user_id: str, token_version: int, user_agent: str, ip_address: str
+    ) -> tuple[str, str]:
+        access_token = security.create_access_token(user_id, token_version=token_version)
+        refresh_token, refresh_expires_at = security.create_refresh_token(user_id)
 
         session_in = SessionCreate(
             user_id=user_id,
-            refresh_token=refresh_token,
+            refresh_token_hash=security.hash_token(refresh_token),
             user_agent=user_agent,
             ip_address=ip_address,
-            expires_at=datetime.now(timezone.utc) + timedelta(days=refresh_token_expires_days)
+            expires_at=refresh_expires_at
         )
 
-        await crud.session.create(db, obj_in=session_in)
+        await crud.session.create_with_cap(db, obj_in=session_in, max_sessions=settings.MAX_SESSIONS_PER_USER)
 
         return access_token, refresh_token
 
-    def create_refresh_token(self, data: dict, expires_in_days: int) -> str:
-        to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(days=expires_in_days)
-        to_encode.update({"exp": expire, "jti": str(uuid.uuid4())})
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-
     async def refresh_session(self, db: AsyncSession, *, refresh_token: str, user_agent: str, ip_address: str) -> tuple[str, str]:
-        session = await self.validate_refresh_token(db, refresh_token)
-        if not session:
+        """
+        Ротация refresh-токена одним `UPDATE ... RETURNING` по его хешу.
+        Подпись не проверяем: совпадение хеша с живой сессией доказывает, что токен выдан нами,
+        а `sub` сверяется в том же UPDATE.
+        """
+        try:
+            user_id = uuid.UUID(token_codec.unverified_claims(refresh_token)["sub"])
+        except (TokenError, KeyError, TypeError, ValueError):
             raise HTTPException(status_code=401, detail="Invalid refresh token")
-        
-        await crud.session.remove(db, id=session.id)
-        
-        return await self.create_session(db, user_id=session.user_id, user_agent=user_agent, ip_address=ip_address)
 
-    async def validate_refresh_token(self, db: AsyncSession, token: str) -> models.Session | None:
-        try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id = payload.get("sub")
-            if user_id is None:
-                return None
-        except JWTError:
-            return None
+        old_hash = security.hash_token(refresh_token)
+        new_refresh_token, refresh_expires_at = security.create_refresh_token(user_id)
 
-        session = await crud.session.get_by_refresh_token(db, refresh_token=token)
-        if not session or session.expires_at < datetime.now(timezone.utc):
-            return None
-
-        return session
+        token_version = await crud.session.rotate(
+            db,
+            user_id=user_id,
+            old_hash=old_hash,
+            new_hash=security.hash_token(new_refresh_token),
+            expires_at=refresh_expires_at,
+            user_agent=user_agent,
+            ip_address=ip_address,
+        )
+        if token_version is None:
+            # Отдельная короткая транзакция: 401 ниже откатывает единицу работы запроса, а отзыв должен остаться
+            async with SessionLocal.begin() as revoke_db:
+                reused_by = await crud.session.revoke_reused(
+                    revoke_db, refresh_token_hash=old_hash, grace_seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS
+                )
+            if reused_by is not None:
+                logger.warning("refresh_token_reuse_detected", user_id=str(reused_by))
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-    async def logout(self, db: AsyncSession, *, refresh_token: str) -> None:
-        session = await crud.session.get_by_refresh_token(db, refresh_token=refresh_token)
-        if session:
-            await crud.session.remove(db, id=session.id)
+        return security.create_access_token(user_id, token_version=token_version), new_refresh_token
+
+    async def logout(self, db: AsyncSession, *, refresh_token: str, access_token: str | None = None) -> None:
+        await crud.session.remove_by_refresh_token_hash(db, refresh_token_hash=security.hash_token(refresh_token))
+        if access_token:
+            await security.revoke_access_token(access_token)
+
+    async def revoke_all_access_tokens(self, db: AsyncSession, *, user_id: uuid.UUID) -> None:
+        """Делает недействительными все выданные access-токены пользователя (например, после смены пароля)."""
+        version = await crud.user.bump_token_version(db, user_id=user_id)
+        if version is not None:
+            # Кеш обновляем только после фиксации, иначе откат оставил бы в нём несуществующую версию
+            on_commit(db, lambda: token_versions.set(user_id, version))
+
+    async def logout_all(self, db: AsyncSession, *, user_id: uuid.UUID, access_token: str | None = None) -> int:
+        removed = await crud.session.remove_all_for_user(db, user_id=user_id)
+        await self.revoke_all_access_tokens(db, user_id=user_id)
+        if access_token:
+            # token_version отсекает остальные токены; предъявленный отзываем сразу,
+            # не дожидаясь истечения кеша версий в других воркерах
+            await security.revoke_access_token(access_token)
+        return removed
 
 auth_service = AuthService()
\ No newline at end of file
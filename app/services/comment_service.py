@@ -52,7 +52,9 @@ class CommentService:
         comment = await self.get_comment(db=db, comment_id=comment_id)
         if comment.authorId != user_id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
-        return await crud.comment.remove(db=db, id=comment_id)
+        if await crud.comment.remove(db=db, id=comment_id) is None:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        return comment
 
 
 comment_service = CommentService()
@@ -47,10 +47,7 @@ class FriendRequestService:
         if friend_request.status != FriendRequestStatus.pending:
             raise HTTPException(status_code=400, detail="Friend request is not pending.")
 
-        friend_request.status = FriendRequestStatus.accepted
-        await db.flush()
-        await db.commit()
-        return friend_request
+        return await crud.friend_request.accept(db, db_obj=friend_request)
 
     async def decline_friend_request(
         self, db: AsyncSession, *, request_id: uuid.UUID, current_user_id: uuid.UUID
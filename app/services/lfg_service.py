@@ -25,13 +25,13 @@ class LFGService:
                     status_code=400,
                     detail="team_id is required for type 'team'",
                 )
-            team = await crud.team.get(db, id=lfg_in.team_id)
-            if not team:
+            access = await crud.team.get_access(db, lfg_in.team_id)
+            if access is None:
                 raise HTTPException(
                     status_code=404,
                     detail="Team not found",
                 )
-            if team.captain_id != creator_id:
+            if access.owner_id != creator_id:
                 raise HTTPException(
                     status_code=403,
                     detail="Only the team captain can create a 'team' LFG post",
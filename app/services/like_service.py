@@ -17,8 +17,9 @@ class LikeService:
         like = await crud.like.get_by_user_and_post(db, user_id=user_id, post_id=post_id)
         if not like:
             raise HTTPException(status_code=404, detail="Like not found")
-        
-        return await crud.like.remove(db=db, id=like.id)
+        if await crud.like.remove(db=db, id=like.id) is None:
+            raise HTTPException(status_code=404, detail="Like not found")
+        return like
 
     async def get_like_count_for_post(self, db: AsyncSession, *, post_id: uuid.UUID) -> int:
         return await crud.like.get_like_count_for_post(db, post_id=post_id)
@@ -0,0 +1,49 @@
+import asyncio
+
+import structlog
+
+from app import crud
+from app.db.session import SessionLocal
+
+logger = structlog.get_logger(__name__)
+
+
+class PostCounterReconciler:
+    """
+    Фоновая сверка `posts.like_count` / `posts.comment_count` с фактическим числом
+    лайков и комментариев. Обходит посты пачками по id, чтобы не держать долгих блокировок.
+
+    Сверка запускается в каждом воркере, но пачку обрабатывает только держатель
+    advisory-блокировки (`crud.post.try_lock_counter_reconcile`); воркер, который
+    её не получил, пропускает проход — таблицу уже обходит другой.
+    """
+
+    async def reconcile_once(self, *, batch_size: int) -> int:
+        fixed = 0
+        after_id = None
+        while True:
+            # Каждая пачка — своя транзакция, фиксируется на выходе из блока
+            async with SessionLocal.begin() as db:
+                if not await crud.post.try_lock_counter_reconcile(db):
+                    return fixed
+                after_id, batch_fixed = await crud.post.reconcile_counters_batch(
+                    db, after_id=after_id, batch_size=batch_size
+                )
+            fixed += batch_fixed
+            if after_id is None:
+                return fixed
+            # Отдаём event loop запросам между пачками
+            await asyncio.sleep(0)
+
+    async def run(self, *, interval: float, batch_size: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                fixed = await self.reconcile_once(batch_size=batch_size)
+                if fixed:
+                    logger.warning("post_counters_drift_repaired", count=fixed)
+            except Exception:
+                logger.exception("post_counter_reconcile_failed")
+
+
+post_counter_reconciler = PostCounterReconciler()
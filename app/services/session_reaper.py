@@ -0,0 +1,36 @@
+import asyncio
+
+import structlog
+
+from app import crud
+from app.db.session import SessionLocal
+
+logger = structlog.get_logger(__name__)
+
+
+class SessionReaper:
+    """Фоновая очистка истёкших сессий ограниченными пачками."""
+
+    async def reap_once(self, *, batch_size: int) -> int:
+        total = 0
+        while True:
+            # Каждая пачка — своя транзакция, фиксируется на выходе из блока
+            async with SessionLocal.begin() as db:
+                deleted = await crud.session.remove_expired_batch(db, batch_size=batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+            # Отдаём event loop запросам между пачками
+            await asyncio.sleep(0)
+
+    async def run(self, *, interval: float, batch_size: int) -> None:
+        while True:
+            try:
+                deleted = await self.reap_once(batch_size=batch_size)
+                if deleted:
+                    logger.info("expired_sessions_reaped", count=deleted)
+            except Exception:
+                logger.exception("session_reaper_failed")
+            await asyncio.sleep(interval)
+
+session_reaper = SessionReaper()
@@ -1,6 +1,7 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
+from app.db.loaders import loaders_for
 from fastapi import HTTPException
 from pydantic import UUID4
 
@@ -12,7 +13,7 @@ class TeamService:
         return await crud.team.create_with_owner(db, obj_in=team_in, owner_id=owner_id)
 
     async def get_team(self, db: AsyncSession, *, team_id: UUID4) -> models.Team:
-        team = await crud.team.get(db, id=team_id)
+        team = await loaders_for(db).teams.load(team_id)
         if not team:
             raise HTTPException(status_code=404, detail="Team not found")
         return team
@@ -33,8 +34,7 @@ class TeamService:
         await crud.team.apply(db, team_id=team_id, user_id=user_id)
 
     async def toggle_team_follow(self, db: AsyncSession, *, team_id: UUID4, user_id: UUID4) -> bool:
-        team = await crud.team.get(db, id=team_id)
-        if not team:
+        if await crud.team.get_access(db, team_id) is None:
             raise HTTPException(status_code=404, detail="Team not found")
 
         return await crud.subscription.toggle(
@@ -1,7 +1,12 @@
 import multiprocessing
+import os
 
 # Количество воркеров. Рекомендуется (2 * CPU) + 1
-workers = multiprocessing.cpu_count() * 2 + 1
+# WEB_CONCURRENCY читает и app/db/session.py, чтобы поделить бюджет соединений с БД между воркерами
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Воркеры наследуют окружение мастера: настройки видят фактическое число воркеров,
+# даже если WEB_CONCURRENCY не задан явно
+os.environ["WEB_CONCURRENCY"] = str(workers)
 
 # Адрес и порт, на котором будет работать Gunicorn
 bind = "0.0.0.0:8000"
@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes
+
+Revision ID: 1f700f2c5bc1
+Revises: 35b55552e4c0
+Create Date: 2026-10-18 14:12:40.318562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f700f2c5bc1'
+down_revision = '35b55552e4c0'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = [
+    ('ix_teams_created_at_id', 'teams', ['created_at', 'id']),
+    ('ix_posts_created_at_id', 'posts', ['created_at', 'id']),
+    ('ix_lfgs_created_at_id', 'lfgs', ['created_at', 'id']),
+    ('ix_sports_created_at_id', 'sports', ['created_at', 'id']),
+    ('ix_playgrounds_created_at_id', 'playgrounds', ['created_at', 'id']),
+    ('ix_comments_postId_created_at_id', 'comments', ['postId', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    # Keyset-пагинация сравнивает (created_at, id); NULL выпал бы из выборки
+    op.execute("UPDATE playgrounds SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('playgrounds', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.alter_column('playgrounds', 'created_at', existing_type=sa.DateTime(), nullable=True)
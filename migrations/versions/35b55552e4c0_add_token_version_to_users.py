@@ -0,0 +1,24 @@
+"""Add token_version to users
+
+Revision ID: 35b55552e4c0
+Revises: ce400c3cf287
+Create Date: 2026-10-18 11:47:09.331560
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '35b55552e4c0'
+down_revision = 'ce400c3cf287'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('users', 'token_version')
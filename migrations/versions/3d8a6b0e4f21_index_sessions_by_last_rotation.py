@@ -0,0 +1,31 @@
+"""Index sessions by user and last rotation for the session cap
+
+Revision ID: 3d8a6b0e4f21
+Revises: 7c2e5f1a9b34
+Create Date: 2026-10-18 17:24:05.771930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8a6b0e4f21'
+down_revision = '7c2e5f1a9b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Лимит сессий теперь вытесняет по последней ротации (updated_at), а не по моменту входа
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sessions_user_id_updated_at', 'sessions', ['user_id', 'updated_at'],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_sessions_user_id_created_at', table_name='sessions', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sessions_user_id_created_at', 'sessions', ['user_id', 'created_at'],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_sessions_user_id_updated_at', table_name='sessions', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""Add symmetric friendships table
+
+Revision ID: 4b9e2d7c1a60
+Revises: ee5a33268623
+Create Date: 2026-10-18 16:02:11.481203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4b9e2d7c1a60'
+down_revision = 'ee5a33268623'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'friendships',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('friend_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('since', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['friend_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'friend_id', name='pk_friendships'),
+    )
+    # Обе стороны каждой принятой заявки
+    op.execute(
+        """
+        INSERT INTO friendships (user_id, friend_id, since)
+        SELECT requester_id, receiver_id, coalesce(updated_at, created_at, now())
+        FROM friend_requests WHERE status = 'accepted'
+        UNION ALL
+        SELECT receiver_id, requester_id, coalesce(updated_at, created_at, now())
+        FROM friend_requests WHERE status = 'accepted'
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('friendships')
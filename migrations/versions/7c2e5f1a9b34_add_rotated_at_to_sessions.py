@@ -0,0 +1,25 @@
+"""Add rotated_at to sessions for the refresh reuse grace window
+
+Revision ID: 7c2e5f1a9b34
+Revises: 4b9e2d7c1a60
+Create Date: 2026-10-18 17:10:42.305118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e5f1a9b34'
+down_revision = '4b9e2d7c1a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Без значения по умолчанию: для уже ротированных сессий момент неизвестен, окно к ним не применяется
+    op.add_column('sessions', sa.Column('rotated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('sessions', 'rotated_at')
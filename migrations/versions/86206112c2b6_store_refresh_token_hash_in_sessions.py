@@ -0,0 +1,39 @@
+"""Store refresh token hash in sessions
+
+Revision ID: 86206112c2b6
+Revises: 26136506f6f1
+Create Date: 2026-10-18 10:12:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '86206112c2b6'
+down_revision = '26136506f6f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('sessions', sa.Column('refresh_token_hash', sa.LargeBinary(length=32), nullable=True))
+    op.add_column('sessions', sa.Column('previous_token_hash', sa.LargeBinary(length=32), nullable=True))
+    # Существующие сессии остаются валидными: хешируем уже выданные токены
+    op.execute("UPDATE sessions SET refresh_token_hash = sha256(convert_to(refresh_token, 'UTF8'))")
+    op.alter_column('sessions', 'refresh_token_hash', nullable=False)
+    op.create_index(op.f('ix_sessions_refresh_token_hash'), 'sessions', ['refresh_token_hash'], unique=True)
+    op.create_index(op.f('ix_sessions_previous_token_hash'), 'sessions', ['previous_token_hash'], unique=False)
+    op.execute("DROP INDEX IF EXISTS ix_sessions_refresh_token")
+    op.drop_column('sessions', 'refresh_token')
+
+
+def downgrade():
+    # Исходные токены из хешей не восстановить — старые сессии удаляются
+    op.execute("DELETE FROM sessions")
+    op.add_column('sessions', sa.Column('refresh_token', sa.String(), nullable=False))
+    op.create_index(op.f('ix_sessions_refresh_token'), 'sessions', ['refresh_token'], unique=True)
+    op.drop_index(op.f('ix_sessions_previous_token_hash'), table_name='sessions')
+    op.drop_index(op.f('ix_sessions_refresh_token_hash'), table_name='sessions')
+    op.drop_column('sessions', 'previous_token_hash')
+    op.drop_column('sessions', 'refresh_token_hash')
@@ -0,0 +1,26 @@
+"""Add session expiry and per-user indexes
+
+Revision ID: ce400c3cf287
+Revises: 86206112c2b6
+Create Date: 2026-10-18 11:03:27.918204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce400c3cf287'
+down_revision = '86206112c2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_sessions_expires_at'), 'sessions', ['expires_at'], unique=False)
+    op.create_index('ix_sessions_user_id_created_at', 'sessions', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sessions_user_id_created_at', table_name='sessions')
+    op.drop_index(op.f('ix_sessions_expires_at'), table_name='sessions')
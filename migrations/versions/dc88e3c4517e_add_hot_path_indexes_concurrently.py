@@ -0,0 +1,54 @@
+"""Add hot path indexes concurrently, drop redundant PK indexes
+
+Revision ID: dc88e3c4517e
+Revises: 1f700f2c5bc1
+Create Date: 2026-10-18 15:02:11.584013
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dc88e3c4517e'
+down_revision = '1f700f2c5bc1'
+branch_labels = None
+depends_on = None
+
+
+# comments("postId") и posts(created_at) уже покрыты индексами keyset-пагинации (1f700f2c5bc1)
+_INDEXES = [
+    ('ix_friend_requests_requester_id_status', 'friend_requests', ['requester_id', 'status']),
+    ('ix_friend_requests_receiver_id_status', 'friend_requests', ['receiver_id', 'status']),
+    ('ix_likes_post_id', 'likes', ['post_id']),
+    ('ix_likes_user_id_post_id', 'likes', ['user_id', 'post_id']),
+    ('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at']),
+    ('ix_invitations_user_id', 'invitations', ['user_id']),
+    ('ix_team_applications_team_id', 'team_applications', ['team_id']),
+]
+
+# Дубли первичных ключей: PK уже обслуживается уникальным индексом pk_*
+_REDUNDANT_PK_INDEXES = [
+    ('ix_sports_id', 'sports', ['id']),
+    ('ix_notifications_id', 'notifications', ['id']),
+    ('ix_invitations_id', 'invitations', ['id']),
+    ('ix_lfgs_id', 'lfgs', ['id']),
+    ('ix_likes_id', 'likes', ['id']),
+]
+
+
+def upgrade():
+    # CONCURRENTLY не работает внутри транзакции и не блокирует запись в таблицы
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in _REDUNDANT_PK_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(_REDUNDANT_PK_INDEXES):
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
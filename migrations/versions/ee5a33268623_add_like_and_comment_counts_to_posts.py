@@ -0,0 +1,33 @@
+"""Add like_count and comment_count to posts
+
+Revision ID: ee5a33268623
+Revises: dc88e3c4517e
+Create Date: 2026-10-18 15:31:52.207746
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ee5a33268623'
+down_revision = 'dc88e3c4517e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE posts SET
+            like_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id),
+            comment_count = (SELECT count(*) FROM comments WHERE comments."postId" = posts.id)
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('posts', 'comment_count')
+    op.drop_column('posts', 'like_count')
@@ -0,0 +1,70 @@
+"""
+Benchmark: per-object CRUDBase.create vs create_many / upsert_many.
+
+Inserts N sponsors each way against DATABASE_URL, reports rows/s and
+removes the rows afterwards. Needs a migrated database.
+
+    python scripts/bench_bulk_crud.py [rows] [chunk_size]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import delete
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import crud
+from app.db.session import SessionLocal, engine
+from app.models import Sponsor
+from app.schemas.sponsor import SponsorCreate
+
+
+def report(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:<28} {rows / seconds:>12,.0f} rows/s  {seconds:>8.3f} s")
+
+
+async def main(rows: int, chunk_size: int) -> None:
+    tag = uuid.uuid4().hex[:8]
+    objs = [SponsorCreate(name=f"bench-{tag}-{i}") for i in range(rows)]
+
+    async with SessionLocal() as db:
+        try:
+            started = time.perf_counter()
+            for obj in objs:
+                # Одна транзакция на объект — как отдельные запросы к API
+                await crud.sponsor.create(db, obj_in=obj)
+                await db.commit()
+            report("create (per object)", rows, time.perf_counter() - started)
+            await db.execute(delete(Sponsor).where(Sponsor.name.like(f"bench-{tag}-%")))
+            await db.commit()
+
+            started = time.perf_counter()
+            created = await crud.sponsor.create_many(db, objs_in=objs, chunk_size=chunk_size)
+            await db.commit()
+            report("create_many", rows, time.perf_counter() - started)
+
+            changes = [{"id": obj.id, "name": obj.name, "contribution": "bench"} for obj in created]
+            started = time.perf_counter()
+            await crud.sponsor.update_many(db, objs_in=changes, chunk_size=chunk_size)
+            await db.commit()
+            report("update_many", rows, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await crud.sponsor.upsert_many(db, objs_in=changes, chunk_size=chunk_size)
+            await db.commit()
+            report("upsert_many", rows, time.perf_counter() - started)
+        finally:
+            await db.execute(delete(Sponsor).where(Sponsor.name.like(f"bench-{tag}-%")))
+            await db.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    ))
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: Python-side cost of building and compiling the hot CRUD queries.
+
+For each query compares the old per-call `select(...)` with the lambda_stmt
+builders from app/crud. Both go through the same compiled cache as
+`Connection.execute`, so the numbers are statement construction plus cache
+key generation and lookup; no database is needed.
+
+    python scripts/bench_statement_cache.py [iterations]
+"""
+import sys
+import timeit
+import uuid
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.compiler import WARN_LINTING
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.crud import crud_like, crud_session, crud_subscription, crud_team, crud_user
+from app.models import Like, Session, Team, User, UserTeam, team_followers
+
+
+def run(label: str, build, iterations: int) -> None:
+    dialect = asyncpg_dialect()
+    cache = {}
+
+    def call():
+        build()._compile_w_cache(
+            dialect, compiled_cache=cache, column_keys=[], for_executemany=False, linting=WARN_LINTING
+        )
+
+    call()  # прогрев кеша компиляции
+    seconds = timeit.timeit(call, number=iterations)
+    print(f"{label:<34} {iterations / seconds:>12,.0f} ops/s  {seconds / iterations * 1e6:>8.2f} us/op")
+
+
+def main(iterations: int) -> None:
+    email = "bench@example.com"
+    token_hash = b"\x00" * 32
+    user_id, post_id, team_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    cases = [
+        (
+            "user.get_by_email",
+            lambda: select(User).where(User.email == email),
+            lambda: crud_user._by_email(email),
+        ),
+        (
+            "user.get_token_version",
+            lambda: select(User.token_version).where(User.id == user_id),
+            lambda: crud_user._token_version(user_id),
+        ),
+        (
+            "session.get_by_refresh_token_hash",
+            lambda: select(Session).where(Session.refresh_token_hash == token_hash),
+            lambda: crud_session._by_refresh_token_hash(token_hash),
+        ),
+        (
+            "like.get_by_user_and_post",
+            lambda: select(Like).filter(Like.user_id == user_id, Like.post_id == post_id),
+            lambda: crud_like._by_user_and_post(user_id, post_id),
+        ),
+        (
+            "subscription.is_subscribed",
+            lambda: select(team_followers).where(
+                team_followers.c.user_id == user_id, team_followers.c.team_id == team_id
+            ),
+            lambda: crud_subscription._subscription(user_id, team_id),
+        ),
+        (
+            "team.get",
+            lambda: select(Team).where(Team.id == team_id).options(
+                selectinload(Team.member_associations).selectinload(UserTeam.user)
+            ),
+            lambda: crud_team._with_members(team_id),
+        ),
+    ]
+    for name, select_builder, lambda_builder in cases:
+        print(name)
+        run("  select()", select_builder, iterations)
+        run("  lambda_stmt", lambda_builder, iterations)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,55 @@
+"""
+Cross-worker revocation check: a jti revoked through one RevocationStore must be
+rejected by a second, independent store once that store has synced.
+
+Each store stands in for a worker, with its own bloom filter. With
+REVOCATION_BACKEND=redis both stores use Redis under a throwaway key. Otherwise
+they share one in-memory backend, which models the same thing inside one
+process. Exits non-zero on failure.
+
+    python scripts/check_revocation_sync.py
+"""
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.redis import close_redis, get_redis
+from app.core.revocation import InMemoryRevocationBackend, RedisRevocationBackend, RevocationStore
+
+
+async def main() -> int:
+    use_redis = settings.REVOCATION_BACKEND == "redis"
+    key = f"auth:revoked:check:{uuid.uuid4()}"
+    backend = RedisRevocationBackend(key=key) if use_redis else InMemoryRevocationBackend()
+    worker_a = RevocationStore(backend, capacity=1000, error_rate=0.001)
+    worker_b = RevocationStore(backend, capacity=1000, error_rate=0.001)
+
+    revoked, live = str(uuid.uuid4()), str(uuid.uuid4())
+    try:
+        await worker_b.sync()
+        await worker_a.revoke(revoked, time.time() + 60)
+        await worker_b.sync()
+
+        checks = {
+            "revoking worker rejects the jti": await worker_a.is_revoked(revoked),
+            "other worker rejects the jti after sync": await worker_b.is_revoked(revoked),
+            "other worker accepts an unrelated jti": not await worker_b.is_revoked(live),
+        }
+    finally:
+        if use_redis:
+            await get_redis().delete(key)
+            await close_redis()
+
+    for name, ok in checks.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,87 @@
+"""
+Index coverage check: EXPLAIN every hot CRUD query and fail on a Seq Scan.
+
+Runs inside a transaction that is always rolled back, with
+`SET LOCAL enable_seqscan = off`. On small or freshly seeded tables the planner
+legitimately prefers a sequential scan, so sizing seed data to force index use
+is fragile. With seqscan disabled, a Seq Scan can only remain in the plan when
+no usable index exists, which is exactly what this check looks for.
+
+The statements come from the CRUD modules' own query builders, so the check
+follows the code. run_tests.sh runs it right after the migrations.
+
+    python scripts/check_seq_scans.py
+"""
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from sqlalchemy.sql import Executable
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import crud
+from app.core.cursor import cursor_codec
+from app.db.session import engine
+
+
+def hot_queries() -> List[Tuple[str, Executable]]:
+    """Each hot query, built by the same CRUD method the app executes it through."""
+    user_id, other_id, post_id, team_id = (uuid.uuid4() for _ in range(4))
+    # A second-page cursor adds the `(created_at, id) < (...)` keyset condition
+    cursor = cursor_codec.encode(datetime.utcnow(), uuid.uuid4())
+    return [
+        ("users.get_by_email", crud.user.by_email_query(email="probe@example.com")),
+        # No NUL bytes: the statement is compiled with literal_binds
+        ("sessions.get_by_refresh_token_hash",
+         crud.session.by_refresh_token_hash_query(refresh_token_hash=b"probe-refresh-token-hash")),
+        ("sessions.create_with_cap", crud.session.excess_sessions_query(user_id=user_id, max_sessions=5)),
+        ("friend_requests.get_received", crud.friend_request.received_query(user_id=user_id)),
+        ("friend_requests.get_friend_request_by_users",
+         crud.friend_request.between_users_query(requester_id=user_id, receiver_id=other_id)),
+        ("friendships.friends_query", crud.friendship.friends_query(user_id=user_id)),
+        ("likes.get_by_user_and_post", crud.like.by_user_and_post_query(user_id=user_id, post_id=post_id)),
+        ("likes.get_like_count_for_post", crud.like.like_count_query(post_id=post_id)),
+        ("comments.get_page_by_post",
+         crud.comment.page_query(cursor=cursor, query=crud.comment.by_post_query(post_id=post_id))),
+        ("posts.get_page", crud.post.page_query(cursor=cursor)),
+        ("notifications.get_notifications_for_user", crud.notification.notifications_for_user_query(user_id)),
+        ("invitations.get_user_invitations", crud.invitation.user_invitations_query(user_id)),
+        ("teams.list_applications", crud.team.applications_query(team_id=team_id)),
+    ]
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name", "?")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for name, query in hot_queries():
+            sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            tables = sorted(set(seq_scans(plan[0]["Plan"])))
+            if tables:
+                failures += 1
+                print(f"FAIL {name}: Seq Scan on {', '.join(tables)}")
+            else:
+                print(f"ok   {name}")
+        await conn.rollback()
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,32 @@
+"""
+Write the patched OpenAPI schema to a file without starting the server.
+
+The output is the exact bytes `/openapi.json` serves. Point OPENAPI_SCHEMA_PATH
+at it and workers load it at startup instead of walking the routes. The client
+generator (openapitools.json) can use it directly as its input spec.
+
+    python scripts/export_openapi.py [output]   # default: openapi.json, "-" for stdout
+"""
+import sys
+from pathlib import Path
+
+import orjson
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.openapi import build_openapi
+from app.main import app
+
+
+def main(output: str) -> None:
+    body = orjson.dumps(build_openapi(app))
+    if output == "-":
+        sys.stdout.buffer.write(body)
+        return
+    Path(output).write_bytes(body)
+    print(f"OpenAPI schema written to {output} ({len(body):,} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "openapi.json")
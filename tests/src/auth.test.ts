@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, TokenResponse } from './helpers';
+import { createUniqueUser, TokenResponse, UserResponse } from './helpers';
 
 describe('Auth API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -69,4 +69,107 @@ describe('Auth API', () => {
     });
     expect(refreshResponse.status).toBe(401);
   });
+
+  test('GET /api/v1/users/me - cached token keeps working, tampered copy is rejected', async () => {
+    const { headers, user } = await createUniqueUser('auth_cache_user');
+
+    // Второй запрос обслуживается из кеша проверенных токенов
+    for (let i = 0; i < 2; i++) {
+      const response = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+      expect(response.status).toBe(200);
+      expect(((await response.json()) as UserResponse).id).toBe(user.id);
+    }
+
+    // Тот же jti с чужой подписью не должен попасть в кеш
+    const [header, payload] = headers.Authorization.split(' ')[1].split('.');
+    const tampered = `${header}.${payload}.${'A'.repeat(43)}`;
+    const response = await fetch(`${API_BASE_URL}/api/v1/users/me`, {
+      headers: { Authorization: `Bearer ${tampered}` },
+    });
+    expect(response.status).toBe(401);
+  });
+
+  test('POST /api/v1/auth/login - concurrent logins share the hashing pool', async () => {
+    const { user } = await createUniqueUser('auth_pool_user');
+    const login = (password: string) => fetch(`${API_BASE_URL}/api/v1/auth/login`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+      body: `username=${encodeURIComponent(user.email)}&password=${encodeURIComponent(password)}`,
+    });
+
+    const responses = await Promise.all([
+      ...Array.from({ length: 4 }, () => login('strongpassword')),
+      login('wrongpassword'),
+    ]);
+    expect(responses.slice(0, 4).map((r) => r.status)).toEqual([200, 200, 200, 200]);
+    expect(responses[4].status).toBe(400);
+  });
+
+  test('POST /api/v1/auth/logout - revokes the presented access token', async () => {
+    const { headers, refreshToken: userRefreshToken } = await createUniqueUser('auth_revoke_user');
+
+    const before = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(before.status).toBe(200);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/auth/logout`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({ refresh_token: userRefreshToken }),
+    });
+    expect(response.status).toBe(200);
+
+    const after = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(after.status).toBe(401);
+  });
+
+  test('POST /api/v1/auth/logout-all - access token stops working', async () => {
+    const { headers } = await createUniqueUser('auth_logout_all_user');
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/auth/logout-all`, { method: 'POST', headers });
+    expect(response.status).toBe(200);
+
+    const after = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(after.status).toBe(401);
+  });
+
+  test('POST /api/v1/auth/refresh - rotated token is rejected, retry does not end the session', async () => {
+    const { refreshToken: original } = await createUniqueUser('auth_rotation_user');
+    const refresh = (token: string) => fetch(`${API_BASE_URL}/api/v1/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: token }),
+    });
+
+    const rotated = await refresh(original);
+    expect(rotated.status).toBe(200);
+    const { refresh_token: next } = await rotated.json() as TokenResponse;
+
+    // Повтор старого токена (как ретрай после потерянного ответа) отклоняется...
+    const reused = await refresh(original);
+    expect(reused.status).toBe(401);
+
+    // ...но в пределах окна не отзывает сессию
+    const afterRetry = await refresh(next);
+    expect(afterRetry.status).toBe(200);
+  });
+
+  test('POST /api/v1/auth/logout-all - tokens from other devices are rejected too', async () => {
+    const { user, headers } = await createUniqueUser('auth_token_version_user');
+
+    // Второе устройство: отдельный вход, свой access-токен
+    const loginResponse = await fetch(`${API_BASE_URL}/api/v1/auth/login`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+      body: `username=${encodeURIComponent(user.email)}&password=strongpassword`,
+    });
+    const otherDevice = { Authorization: `Bearer ${(await loginResponse.json() as TokenResponse).access_token}` };
+    expect((await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers: otherDevice })).status).toBe(200);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/auth/logout-all`, { method: 'POST', headers });
+    expect(response.status).toBe(200);
+
+    // Этот токен не предъявлялся при выходе: его отсекает повышенный token_version
+    const after = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers: otherDevice });
+    expect(after.status).toBe(401);
+  });
 });
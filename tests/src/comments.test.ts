@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, createPost, createComment, cleanup, CommentResponse } from './helpers';
+import { createUniqueUser, createPost, createComment, cleanup, CommentResponse, CursorPage } from './helpers';
 
 describe('Comments API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -48,7 +48,7 @@ describe('Comments API', () => {
       headers,
     });
     expect(response.status).toBe(200);
-    const comments = await response.json() as CommentResponse[];
+    const comments = (await response.json() as CursorPage<CommentResponse>).data;
     expect(comments.length).toBe(2);
   });
 
@@ -70,6 +70,32 @@ describe('Friend Requests API', () => {
     expect(friends.data.some(friend => friend.id === user4.id)).toBe(true);
   });
 
+  test('DELETE /api/v1/friend-requests/friends/{friend_id} - should remove a friend for both users', async () => {
+    const { user: user1, headers: headers1 } = await createUniqueUser('fr_test_user14');
+    const { user: user2, headers: headers2 } = await createUniqueUser('fr_test_user15');
+
+    const fr = await sendFriendRequest(headers1, user2.id);
+    await acceptFriendRequest(headers2, fr.id);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/friend-requests/friends/${user1.id}`, {
+        method: 'DELETE',
+        headers: headers2,
+    });
+    expect(response.status).toBe(200);
+
+    const friends1 = await getFriends(headers1);
+    expect(friends1.data.some(friend => friend.id === user2.id)).toBe(false);
+    const friends2 = await getFriends(headers2);
+    expect(friends2.data.some(friend => friend.id === user1.id)).toBe(false);
+
+    // Повторное удаление — друга уже нет
+    const again = await fetch(`${API_BASE_URL}/api/v1/friend-requests/friends/${user1.id}`, {
+        method: 'DELETE',
+        headers: headers2,
+    });
+    expect(again.status).toBe(404);
+  });
+
   test('POST /api/v1/friend-requests - should not send a friend request to oneself', async () => {
     const { user: user1, headers: headers1 } = await createUniqueUser('fr_test_user9');
 
@@ -45,6 +45,8 @@ export type PostResponse = {
   id: string;
   content: string;
   author_id: string;
+  like_count: number;
+  comment_count: number;
 }
 
 export type CommentResponse = {
@@ -90,6 +92,14 @@ export type PaginatedTeamResponse = {
   data: TeamResponse[];
 }
 
+export type CursorPage<T> = {
+  meta: {
+    limit: number;
+    next_cursor: string | null;
+  };
+  data: T[];
+}
+
 export type ApplicationResponse = {
     id: string;
     user_id: string;
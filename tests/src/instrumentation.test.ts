@@ -0,0 +1,76 @@
+
+import fetch from 'node-fetch';
+import { createUniqueUser, cleanup } from './helpers';
+
+// Значение метрики из текстового формата Prometheus (/metrics); 0, если серии ещё нет
+async function readMetric(name: string, labels: string): Promise<number> {
+  const response = await fetch('http://localhost:8080/metrics');
+  expect(response.status).toBe(200);
+  const text = await response.text();
+  const line = text.split('\n').find(l => l.startsWith(`${name}{`) && l.includes(labels));
+  return line ? parseFloat(line.split(' ').pop() as string) : 0;
+}
+
+describe('SQL instrumentation', () => {
+  const API_BASE_URL = 'http://localhost:8080';
+
+  jest.setTimeout(30000);
+
+  afterAll(async () => {
+    await cleanup();
+  });
+
+  test('GET /api/v1/users/me - should report database time in Server-Timing', async () => {
+    const { headers } = await createUniqueUser('instrumentation_timing');
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(response.status).toBe(200);
+
+    const serverTiming = response.headers.get('server-timing');
+    expect(serverTiming).not.toBeNull();
+    expect(serverTiming).toMatch(/^db;dur=\d+\.\d{2};desc="(\d+) queries", db-slowest;dur=\d+\.\d{2}$/);
+    const queries = parseInt((serverTiming as string).match(/desc="(\d+) queries"/)![1], 10);
+    expect(queries).toBeGreaterThan(0);
+  });
+
+  test('GET /health - should not send Server-Timing when no SQL was run', async () => {
+    const response = await fetch(`${API_BASE_URL}/health`);
+    expect(response.status).toBe(200);
+    expect(response.headers.get('server-timing')).toBeNull();
+  });
+
+  test('GET /metrics - should count SQL per request under the route template', async () => {
+    const { user, headers } = await createUniqueUser('instrumentation_metrics');
+    const series = 'route="/api/v1/users/{user_id}"';
+    const before = await readMetric('db_queries_per_request_count', series);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/users/${user.id}`, { headers });
+    expect(response.status).toBe(200);
+
+    const after = await readMetric('db_queries_per_request_count', series);
+    // Другие тесты могут идти параллельно и обращаться к тому же маршруту
+    expect(after).toBeGreaterThanOrEqual(before + 1);
+  });
+
+  // run_tests.sh опускает SLOW_QUERY_THRESHOLD_MS почти до нуля: медленным считается каждый запрос
+  test('GET /metrics - should log slow queries per route and capture their plans', async () => {
+    const { headers } = await createUniqueUser('instrumentation_slow');
+    const series = 'route="/api/v1/users/me"';
+    const before = await readMetric('db_slow_queries_total', series);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(response.status).toBe(200);
+    const queries = parseInt(response.headers.get('server-timing')!.match(/desc="(\d+) queries"/)![1], 10);
+
+    const after = await readMetric('db_slow_queries_total', series);
+    expect(after - before).toBeGreaterThanOrEqual(queries);
+
+    // EXPLAIN снимается в фоне после ответа
+    let captured = 0;
+    for (let attempt = 0; attempt < 20 && captured === 0; attempt++) {
+      captured = await readMetric('db_slow_query_plans_total', 'outcome="captured"');
+      if (captured === 0) await new Promise(resolve => setTimeout(resolve, 250));
+    }
+    expect(captured).toBeGreaterThan(0);
+  });
+});
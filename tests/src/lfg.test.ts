@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, cleanup, LfgResponse } from './helpers';
+import { createUniqueUser, cleanup, LfgResponse, CursorPage } from './helpers';
 
 describe('LFG API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -37,7 +37,7 @@ describe('LFG API', () => {
         headers,
     });
     expect(response.status).toBe(200);
-    const lfgs = await response.json() as LfgResponse[];
+    const lfgs = (await response.json() as CursorPage<LfgResponse>).data;
     expect(lfgs.length).toBeGreaterThan(0);
   });
 });
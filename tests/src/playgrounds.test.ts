@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, cleanup, PlaygroundResponse } from './helpers';
+import { createUniqueUser, cleanup, PlaygroundResponse, CursorPage } from './helpers';
 
 describe('Playgrounds API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -36,7 +36,7 @@ describe('Playgrounds API', () => {
 
     const response = await fetch(`${API_BASE_URL}/api/v1/playgrounds`);
     expect(response.status).toBe(200);
-    const playgrounds = await response.json() as PlaygroundResponse[];
+    const playgrounds = (await response.json() as CursorPage<PlaygroundResponse>).data;
     expect(Array.isArray(playgrounds)).toBe(true);
     expect(playgrounds.length).toBeGreaterThan(0);
     expect(playgrounds.some((p: any) => p.name === playgroundName)).toBe(true);
@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, createPost, cleanup, PostResponse } from './helpers';
+import { createUniqueUser, createPost, cleanup, PostResponse, CursorPage } from './helpers';
 
 describe('Posts API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -38,6 +38,24 @@ describe('Posts API', () => {
     expect(post.id).toBe(newPost.id);
   });
 
+  test('GET /api/v1/posts/{post_id} - should answer 304 to a matching If-None-Match', async () => {
+    const newPost = await createPost(headers, 'A post to be revalidated');
+    const first = await fetch(`${API_BASE_URL}/api/v1/posts/${newPost.id}`, { headers });
+    expect(first.status).toBe(200);
+    const etag = first.headers.get('etag');
+    expect(etag).toBeTruthy();
+
+    const second = await fetch(`${API_BASE_URL}/api/v1/posts/${newPost.id}`, {
+      headers: { ...headers, 'If-None-Match': etag! },
+    });
+    expect(second.status).toBe(304);
+
+    const other = await fetch(`${API_BASE_URL}/api/v1/posts/${newPost.id}`, {
+      headers: { ...headers, 'If-None-Match': 'W/"stale"' },
+    });
+    expect(other.status).toBe(200);
+  });
+
   test('GET /api/v1/posts - should retrieve all posts', async () => {
     await createPost(headers, 'Post 1');
     await createPost(headers, 'Post 2');
@@ -46,7 +64,7 @@ describe('Posts API', () => {
       headers,
     });
     expect(response.status).toBe(200);
-    const posts = await response.json() as PostResponse[];
+    const posts = (await response.json() as CursorPage<PostResponse>).data;
     expect(posts.length).toBeGreaterThanOrEqual(2);
   });
 
@@ -1,6 +1,6 @@
 
 import fetch from 'node-fetch';
-import { createUniqueUser, cleanup, SportResponse } from './helpers';
+import { createUniqueUser, cleanup, SportResponse, CursorPage } from './helpers';
 
 describe('Sports API', () => {
   const API_BASE_URL = 'http://localhost:8080';
@@ -36,9 +36,38 @@ describe('Sports API', () => {
 
     const response = await fetch(`${API_BASE_URL}/api/v1/sports`);
     expect(response.status).toBe(200);
-    const sports = await response.json() as SportResponse[];
+    const sports = (await response.json() as CursorPage<SportResponse>).data;
     expect(Array.isArray(sports)).toBe(true);
     expect(sports.length).toBeGreaterThan(0);
     expect(sports.some((sport: any) => sport.name === sportName)).toBe(true);
   });
+
+  test('GET /api/v1/sports - should serve repeated reads from the cache until a sport is created', async () => {
+    const { headers } = await createUniqueUser('sports_cache');
+
+    const first = await fetch(`${API_BASE_URL}/api/v1/sports`);
+    expect(first.status).toBe(200);
+    const firstBody = await first.text();
+
+    const second = await fetch(`${API_BASE_URL}/api/v1/sports`);
+    expect(second.status).toBe(200);
+    expect(await second.text()).toBe(firstBody);
+    // Ответ из кеша собран без SQL — заголовка Server-Timing нет
+    expect(second.headers.get('server-timing')).toBeNull();
+
+    const sportName = `Cached Sport ${Math.random()}`;
+    const created = await fetch(`${API_BASE_URL}/api/v1/sports`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({ name: sportName, description: 'Invalidates the cached list' }),
+    });
+    expect(created.status).toBe(200);
+
+    const third = await fetch(`${API_BASE_URL}/api/v1/sports`);
+    expect(third.status).toBe(200);
+    const thirdBody = await third.text();
+    expect(thirdBody).not.toBe(firstBody);
+    const sports = (JSON.parse(thirdBody) as CursorPage<SportResponse>).data;
+    expect(sports[0].name).toBe(sportName);
+  });
 });
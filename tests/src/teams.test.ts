@@ -137,4 +137,71 @@ describe('Teams endpoints', () => {
     expect(updatedTeam.members.some(m => m.id === member.id)).toBe(false);
   });
 
+  test('GET /api/v1/teams/{team_id} - should revalidate with ETag and change it after accept', async () => {
+    const { headers: captainHeaders } = await createUniqueUser('etag_captain');
+    const { headers: applicantHeaders, user: applicant } = await createUniqueUser('etag_applicant');
+    const team = await createTeam(captainHeaders, createUniqueName('Team for ETag'));
+
+    const first = await fetch(`${API_BASE_URL}/api/v1/teams/${team.id}`, { headers: captainHeaders });
+    expect(first.status).toBe(200);
+    const etag = first.headers.get('etag');
+    expect(etag).not.toBeNull();
+
+    const notModified = await fetch(`${API_BASE_URL}/api/v1/teams/${team.id}`, {
+      headers: { ...captainHeaders, 'If-None-Match': etag as string },
+    });
+    expect(notModified.status).toBe(304);
+    expect(notModified.headers.get('etag')).toBe(etag);
+
+    await applyToTeam(applicantHeaders, team.id);
+    await respondToApplication(captainHeaders, team.id, applicant.id, true);
+
+    const changed = await fetch(`${API_BASE_URL}/api/v1/teams/${team.id}`, {
+      headers: { ...captainHeaders, 'If-None-Match': etag as string },
+    });
+    expect(changed.status).toBe(200);
+    expect(changed.headers.get('etag')).not.toBe(etag);
+    const updatedTeam = (await changed.json()) as TeamResponse;
+    expect(updatedTeam.members.some((m) => m.id === applicant.id)).toBe(true);
+  });
+
+  test('GET /api/v1/teams/{team_id} - should load owner and members in batches', async () => {
+    async function teamWithMembers(prefix: string, count: number) {
+      const { headers: captainHeaders, user: captain } = await createUniqueUser(`${prefix}_captain`);
+      const team = await createTeam(captainHeaders, createUniqueName(`Team ${prefix}`));
+      const members = [];
+      for (let i = 0; i < count; i++) {
+        const { headers, user } = await createUniqueUser(`${prefix}_member${i}`);
+        await applyToTeam(headers, team.id);
+        await respondToApplication(captainHeaders, team.id, user.id, true);
+        members.push(user);
+      }
+      return { team, captain, members };
+    }
+
+    // Без авторизации: в счёт идут только версия команды и её загрузка
+    async function readTeam(teamId: string) {
+      const response = await fetch(`${API_BASE_URL}/api/v1/teams/${teamId}`);
+      expect(response.status).toBe(200);
+      const queries = parseInt(response.headers.get('server-timing')!.match(/desc="(\d+) queries"/)![1], 10);
+      return { team: (await response.json()) as TeamResponse, queries };
+    }
+
+    const small = await teamWithMembers('loader_small', 1);
+    const large = await teamWithMembers('loader_large', 3);
+
+    const smallRead = await readTeam(small.team.id);
+    const largeRead = await readTeam(large.team.id);
+
+    expect(largeRead.team.owner.id).toBe(large.captain.id);
+    expect(largeRead.team.owner.nickname).toBe(large.captain.nickname);
+    for (const member of large.members) {
+      const loaded = largeRead.team.members.find((m) => m.id === member.id);
+      expect(loaded).toBeDefined();
+      expect(loaded!.nickname).toBe(member.nickname);
+    }
+    // Участники грузятся одним запросом, а не по одному
+    expect(largeRead.queries).toBe(smallRead.queries);
+  }, 30000);
+
 });
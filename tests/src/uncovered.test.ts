@@ -10,6 +10,7 @@ import {
   TeamResponse,
   UserResponse,
   LfgResponse,
+  CursorPage,
 } from './helpers';
 
 describe('Uncovered endpoints', () => {
@@ -24,11 +25,11 @@ describe('Uncovered endpoints', () => {
     const teamName = createUniqueName('Team for all teams');
     await createTeam(headers, teamName);
 
-    const response = await fetch(`${API_BASE_URL}/api/v1/teams?limit=1000`, {
+    const response = await fetch(`${API_BASE_URL}/api/v1/teams`, {
       headers,
     });
     expect(response.status).toBe(200);
-    const teams = (await response.json()) as TeamResponse[];
+    const teams = ((await response.json()) as CursorPage<TeamResponse>).data;
     expect(teams.length).toBeGreaterThan(0);
     expect(teams.some((team) => team.name === teamName)).toBe(true);
   });
@@ -73,7 +74,7 @@ describe('Uncovered endpoints', () => {
     });
 
     expect(response.status).toBe(200);
-    const lfgs = (await response.json()) as LfgResponse[];
+    const lfgs = ((await response.json()) as CursorPage<LfgResponse>).data;
     expect(lfgs.some((l) => l.id === lfg.id)).toBe(true);
   });
 });
@@ -44,6 +44,21 @@ describe('Users API', () => {
     expect(foundUser.nickname).toBe(user2.nickname);
   });
 
+  test('GET /api/v1/users/{user_id} - should return the same profile as /me and 404 for an unknown id', async () => {
+    const { user, headers } = await createUniqueUser('users_test_loader');
+
+    const meResponse = await fetch(`${API_BASE_URL}/api/v1/users/me`, { headers });
+    expect(meResponse.status).toBe(200);
+    const me = await meResponse.json() as UserResponse;
+
+    const byIdResponse = await fetch(`${API_BASE_URL}/api/v1/users/${user.id}`, { headers });
+    expect(byIdResponse.status).toBe(200);
+    expect(await byIdResponse.json()).toEqual(me);
+
+    const missing = await fetch(`${API_BASE_URL}/api/v1/users/00000000-0000-4000-8000-000000000000`, { headers });
+    expect(missing.status).toBe(404);
+  });
+
   test('GET /api/v1/users/{user_id}/friends - should list user friends', async () => {
       const { user: user1, headers: headers1 } = await createUniqueUser('users_test_friends1');
       const { user: user2, headers: headers2 } = await createUniqueUser('users_test_friends2');